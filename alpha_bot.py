@@ -1,16 +1,29 @@
 import os
-import requests
 import time
 import logging
 import random
-import re
-import aiohttp
 import asyncio
-from datetime import datetime, timedelta
+from datetime import datetime
 import base64
 import json
 from flask import Flask, Response
 
+from analysis_pool import AnalysisExecutor
+from auth import TokenManager
+from batching import build_search_queries, build_twitter_queries, legacy_twitter_requests, pack_subreddits, unique_names
+from dedup import DedupStore, NearDuplicateIndex
+from features import FeatureExtractor, epoch_ms, now_ms, parse_iso8601_ms
+from http_client import HttpClient
+from keyword_matcher import KeywordMatcher
+from pattern_engine import PatternEngine
+from pipeline import StreamPipeline, TopKSelector
+from scheduler import PollSchedule, poll_forever
+from scoring import BatchScorer
+from state_store import StateStore
+from telegram_queue import TelegramSender
+from throttle import QuotaPlanner, RateGovernor, run_bounded
+from trending import TrendingEngine
+
 # Configurar logging
 logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
@@ -40,23 +53,66 @@ REDDIT_USER_AGENT = os.environ.get('REDDIT_USER_AGENT', 'AlphaHunterBot/1.0 by Y
 
 # Configurações Twitter API
 TWITTER_BEARER_TOKEN = os.environ.get('TWITTER_BEARER_TOKEN')
+TWITTER_MAX_PAGES = int(os.environ.get('TWITTER_MAX_PAGES', 3))
+TWITTER_QUERY_MAX_LENGTH = int(os.environ.get('TWITTER_QUERY_MAX_LENGTH', 512))
+TWITTER_CASHTAGS = [tag.strip() for tag in os.environ.get('TWITTER_CASHTAGS', '').split(',') if tag.strip()]
 
 # Configurações Telegram
 TELEGRAM_TOKEN = os.environ.get('TELEGRAM_TOKEN')
 CHAT_ID = os.environ.get('CHAT_ID')
+TELEGRAM_CHAT_PER_MINUTE = int(os.environ.get('TELEGRAM_CHAT_PER_MINUTE', 20))
+TELEGRAM_GLOBAL_PER_SECOND = int(os.environ.get('TELEGRAM_GLOBAL_PER_SECOND', 30))
+
+# Configurações do Bot
+REDDIT_QPM = int(os.environ.get('REDDIT_QPM', 90))
+REDDIT_CONCURRENCY = int(os.environ.get('REDDIT_CONCURRENCY', 6))
+REDDIT_MAX_PAGES = int(os.environ.get('REDDIT_MAX_PAGES', 5))
+REDDIT_CURSOR_RECHECK = int(os.environ.get('REDDIT_CURSOR_RECHECK', 10))
+HTTP_POOL_LIMIT = int(os.environ.get('HTTP_POOL_LIMIT', 100))
+HTTP_LIMIT_PER_HOST = int(os.environ.get('HTTP_LIMIT_PER_HOST', 20))
+DEDUP_TTL_HOURS = int(os.environ.get('DEDUP_TTL_HOURS', 48))
+DEDUP_BLOOM_CAPACITY = int(os.environ.get('DEDUP_BLOOM_CAPACITY', 200000))
+NEAR_DUP_WINDOW_HOURS = int(os.environ.get('NEAR_DUP_WINDOW_HOURS', 6))
+NEAR_DUP_THRESHOLD = float(os.environ.get('NEAR_DUP_THRESHOLD', 0.7))
+STATE_DB_PATH = os.environ.get('STATE_DB_PATH', 'alpha_state.db')
+PIPELINE_MODE = os.environ.get('PIPELINE_MODE', 'stream')  # stream | batch
+PIPELINE_QUEUE_SIZE = int(os.environ.get('PIPELINE_QUEUE_SIZE', 200))
+PIPELINE_WORKERS = int(os.environ.get('PIPELINE_WORKERS', 2))
+ANALYSIS_MODE = os.environ.get('ANALYSIS_MODE', 'inline')  # inline | process
+ANALYSIS_WORKERS = int(os.environ.get('ANALYSIS_WORKERS', 0))  # 0 = um por núcleo
+ANALYSIS_CHUNK_SIZE = int(os.environ.get('ANALYSIS_CHUNK_SIZE', 20))
+ANALYSIS_MIN_CHARS = int(os.environ.get('ANALYSIS_MIN_CHARS', 4000))
+SCORING_MODE = os.environ.get('SCORING_MODE', 'python')  # python | numpy
+CANDIDATES_PER_CYCLE = int(os.environ.get('CANDIDATES_PER_CYCLE', 20))
+TRENDING_VELOCITY = float(os.environ.get('TRENDING_VELOCITY', 4.0))
+TRENDING_MIN_MENTIONS = int(os.environ.get('TRENDING_MIN_MENTIONS', 3))
+TRENDING_CAPACITY = int(os.environ.get('TRENDING_CAPACITY', 1000))
+TRENDING_COOLDOWN = int(os.environ.get('TRENDING_COOLDOWN', 3600))
+CANDIDATE_SPILL_SIZE = int(os.environ.get('CANDIDATE_SPILL_SIZE', 80))
+CHECK_INTERVAL = int(os.environ.get('CHECK_INTERVAL', 180))
+REDDIT_MIN_INTERVAL = int(os.environ.get('REDDIT_MIN_INTERVAL', 30))
+REDDIT_MAX_INTERVAL = int(os.environ.get('REDDIT_MAX_INTERVAL', 900))
+TWITTER_MIN_INTERVAL = int(os.environ.get('TWITTER_MIN_INTERVAL', 60))
+TWITTER_MAX_INTERVAL = int(os.environ.get('TWITTER_MAX_INTERVAL', 900))
+POLL_TARGET_ITEMS = int(os.environ.get('POLL_TARGET_ITEMS', 3))
 
 class RedditAPI:
-    def __init__(self):
-        self.access_token = None
-        self.token_expiry = None
-        self.session = aiohttp.ClientSession()
+    def __init__(self, http):
+        self.http = http
+        self.token_manager = TokenManager(self.request_token)
         self.banned_subreddits = set()
+        self.request_budget = RateGovernor(REDDIT_QPM)
+        self.subreddit_stats = {}
+        self.cursors = {}
+        self.group_cursors = {}
+        self.empty_polls = {}
     
     async def get_access_token(self):
-        """Obtém access token da API do Reddit"""
-        if self.access_token and self.token_expiry and datetime.now() < self.token_expiry:
-            return self.access_token
-        
+        """Obtém access token da API do Reddit (refresh único, renovado antes de expirar)"""
+        return await self.token_manager.get()
+    
+    async def request_token(self):
+        """POST /api/v1/access_token; retorna (token, expires_in) ou None"""
         auth = base64.b64encode(f"{REDDIT_CLIENT_ID}:{REDDIT_CLIENT_SECRET}".encode()).decode()
         
         headers = {
@@ -71,18 +127,16 @@ class RedditAPI:
         }
         
         try:
-            async with self.session.post(
+            async with self.http.session.post(
                 'https://www.reddit.com/api/v1/access_token',
                 headers=headers,
                 data=data,
-                timeout=10
+                timeout=self.http.timeout(10)
             ) as response:
                 if response.status == 200:
                     result = await response.json()
-                    self.access_token = result['access_token']
-                    self.token_expiry = datetime.now() + timedelta(seconds=result['expires_in'] - 60)
                     logger.info("✅ Reddit API token obtido com sucesso!")
-                    return self.access_token
+                    return result['access_token'], result['expires_in']
                 else:
                     error_text = await response.text()
                     logger.error(f"❌ Erro ao obter token: {response.status}")
@@ -91,21 +145,54 @@ class RedditAPI:
             logger.error(f"❌ Exception getting token: {e}")
             return None
     
+    async def fetch_listing(self, path, params, subreddits):
+        """GET autenticado numa listing do Reddit; retorna (status, posts, children)
+        
+        O ritmo vem do RateGovernor (headers X-Ratelimit-*); em 429 espera o
+        tempo pedido pelo servidor e tenta mais uma vez.
+        """
+        for attempt in range(2):
+            token = await self.get_access_token()
+            if not token:
+                return None, [], []
+            
+            headers = {
+                'User-Agent': REDDIT_USER_AGENT,
+                'Authorization': f'Bearer {token}'
+            }
+            
+            await self.request_budget.acquire()
+            
+            async with self.http.session.get(
+                f'https://oauth.reddit.com{path}',
+                headers=headers,
+                params=params,
+                timeout=self.http.timeout(15)
+            ) as response:
+                self.request_budget.update(response.headers)
+                
+                if response.status == 200:
+                    data = await response.json()
+                    children = data.get('data', {}).get('children', [])
+                    return response.status, self.parse_posts(data, subreddits), children
+                
+                if response.status != 429:
+                    if response.status not in (403, 404):
+                        logger.warning(f"⚠️  Reddit {path} retornou {response.status}")
+                    return response.status, [], []
+                
+                # Rate limit: espera exatamente o que o servidor pedir e tenta de novo
+                retry_after = float(response.headers.get('Retry-After') or response.headers.get('X-Ratelimit-Reset') or 60)
+                logger.warning(f"⚠️  Reddit rate limit (429) - aguardando {retry_after:.0f}s")
+                self.request_budget.backoff(retry_after)
+        
+        return 429, [], []
+    
     async def search_posts(self, subreddit, query, limit=20):
         """Busca posts usando API oficial"""
         if subreddit in self.banned_subreddits:
             return []
-            
-        token = await self.get_access_token()
-        if not token:
-            return []
         
-        headers = {
-            'User-Agent': REDDIT_USER_AGENT,
-            'Authorization': f'Bearer {token}'
-        }
-        
-        url = f'https://oauth.reddit.com/search'
         params = {
             'q': f'subreddit:{subreddit} {query}',
             'sort': 'new',
@@ -115,21 +202,11 @@ class RedditAPI:
         }
         
         try:
-            async with self.session.get(
-                url,
-                headers=headers,
-                params=params,
-                timeout=15
-            ) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return self.parse_posts(data)
-                elif response.status == 404:
-                    logger.warning(f"⚠️  Subreddit r/{subreddit} banado/privado")
-                    self.banned_subreddits.add(subreddit)
-                    return []
-                else:
-                    return []
+            status, posts, _ = await self.fetch_listing('/search', params, [subreddit])
+            if status == 404:
+                logger.warning(f"⚠️  Subreddit r/{subreddit} banado/privado")
+                self.banned_subreddits.add(subreddit)
+            return posts
         except Exception as e:
             logger.error(f"❌ Search exception: {e}")
             return []
@@ -138,58 +215,164 @@ class RedditAPI:
         """Pega posts novos usando API oficial"""
         if subreddit in self.banned_subreddits:
             return []
-            
-        token = await self.get_access_token()
-        if not token:
-            return []
-        
-        headers = {
-            'User-Agent': REDDIT_USER_AGENT,
-            'Authorization': f'Bearer {token}'
-        }
-        
-        url = f'https://oauth.reddit.com/r/{subreddit}/new'
-        params = {'limit': min(limit, 15)}
         
         try:
-            async with self.session.get(
-                url,
-                headers=headers,
-                params=params,
-                timeout=15
-            ) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return self.parse_posts(data)
-                elif response.status == 404:
-                    logger.warning(f"⚠️  Subreddit r/{subreddit} banado/privado")
-                    self.banned_subreddits.add(subreddit)
-                    return []
-                else:
-                    return []
+            status, posts, _ = await self.fetch_listing(f'/r/{subreddit}/new', {'limit': min(limit, 15)}, [subreddit])
+            if status == 404:
+                logger.warning(f"⚠️  Subreddit r/{subreddit} banado/privado")
+                self.banned_subreddits.add(subreddit)
+            return posts
         except Exception as e:
             logger.error(f"❌ New posts exception: {e}")
             return []
     
-    def parse_posts(self, data):
+    async def get_new_posts_batch(self, subreddits, limit=100, on_posts=None):
+        """Pega posts novos de vários subreddits com listings r/a+b+c/new"""
+        active = [s for s in subreddits if s not in self.banned_subreddits]
+        groups = pack_subreddits(active)
+        
+        async def fetch_group(group):
+            posts = await self.fetch_new_group(group, limit)
+            if on_posts:
+                # Streaming: cada grupo segue para o pipeline assim que chega
+                await on_posts(posts)
+            return posts
+        
+        results = await run_bounded(groups, fetch_group, REDDIT_CONCURRENCY)
+        
+        posts = []
+        for group, result in zip(groups, results):
+            if isinstance(result, Exception):
+                logger.error(f"❌ New posts exception (r/{'+'.join(group)}): {result}")
+                continue
+            posts.extend(result)
+        return posts
+    
+    async def fetch_new_group(self, group, limit):
+        """Listing r/a+b+c/new só com posts novos; em 403/404 divide o grupo até achar o subreddit banido"""
+        key = '+'.join(group)
+        params = {'limit': min(limit, 100)}
+        
+        # Cursor before= do próprio grupo (fullname mais novo que esta listing já devolveu);
+        # sem ele (grupo com composição nova ou em revalidação) pega só a página mais nova
+        cursor = self.group_cursors.get(key)
+        if cursor and self.empty_polls.get(key, REDDIT_CURSOR_RECHECK) < REDDIT_CURSOR_RECHECK:
+            params['before'] = cursor
+        else:
+            if len(self.empty_polls) > 1000:
+                self.empty_polls.clear()
+                self.group_cursors.clear()
+            self.empty_polls[key] = 0
+        
+        status, posts, children = await self.fetch_listing(f'/r/{key}/new', params, group)
+        
+        if status in (403, 404):
+            if len(group) == 1:
+                logger.warning(f"⚠️  Subreddit r/{group[0]} banado/privado")
+                self.banned_subreddits.add(group[0])
+                return []
+            
+            middle = len(group) // 2
+            left, right = await asyncio.gather(
+                self.fetch_new_group(group[:middle], limit),
+                self.fetch_new_group(group[middle:], limit)
+            )
+            return left + right
+        
+        # Rajada maior que uma página: segue paginando para frente até alcançar o topo
+        pages = 1
+        newest = children[0]['data']['name'] if children else None
+        while 'before' in params and len(children) >= params['limit'] and pages < REDDIT_MAX_PAGES:
+            params['before'] = newest
+            status, page_posts, children = await self.fetch_listing(f'/r/{key}/new', params, group)
+            if status != 200:
+                break
+            posts.extend(page_posts)
+            if children:
+                newest = children[0]['data']['name']
+            pages += 1
+        
+        # Próximo poll segue desta listing; as marcas por subreddit só filtram (filter_new)
+        if newest:
+            self.group_cursors[key] = newest
+        
+        posts = self.filter_new(posts)
+        self.empty_polls[key] = 0 if posts else self.empty_polls.get(key, 0) + 1
+        return posts
+    
+    def filter_new(self, posts):
+        """Descarta posts abaixo do high-water mark do subreddit e avança as marcas"""
+        fresh = []
+        for post in posts:
+            mark = self.cursors.get(post['subreddit'])
+            if mark and (post['created_utc'] < mark['created_utc'] or f"t3_{post['id']}" == mark['name']):
+                continue
+            fresh.append(post)
+        
+        for post in fresh:
+            mark = self.cursors.get(post['subreddit'])
+            if not mark or post['created_utc'] >= mark['created_utc']:
+                self.cursors[post['subreddit']] = {'name': f"t3_{post['id']}", 'created_utc': post['created_utc']}
+        
+        return fresh
+    
+    async def search_posts_batch(self, subreddits, keywords, limit=100, on_posts=None):
+        """Busca várias keywords em vários subreddits com queries OR combinadas"""
+        active = [s for s in subreddits if s not in self.banned_subreddits]
+        queries = build_search_queries(active, keywords)
+        
+        async def run_query(item):
+            names, query = item
+            params = {
+                'q': query,
+                'sort': 'new',
+                'limit': min(limit, 100),
+                't': 'day',
+                'type': 'link'
+            }
+            status, posts, _ = await self.fetch_listing('/search', params, names)
+            if on_posts:
+                await on_posts(posts)
+            return posts
+        
+        results = await run_bounded(queries, run_query, REDDIT_CONCURRENCY)
+        
+        posts = []
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"❌ Search exception: {result}")
+                continue
+            posts.extend(result)
+        return posts
+    
+    def parse_posts(self, data, subreddits=None):
         """Parseia os posts da API response"""
         posts = []
+        received_ms = now_ms()
+        
+        # Devolve cada post ao subreddit de origem com o nome configurado no bot
+        lookup = {name.lower(): name for name in subreddits} if subreddits else {}
         
         if 'data' in data and 'children' in data['data']:
             for child in data['data']['children']:
                 post_data = child['data']
                 
                 if not post_data.get('stickied') and not post_data.get('over_18'):
+                    subreddit = post_data.get('subreddit', '')
+                    subreddit = lookup.get(subreddit.lower(), subreddit)
+                    self.subreddit_stats[subreddit] = self.subreddit_stats.get(subreddit, 0) + 1
+                    
                     posts.append({
                         'title': post_data.get('title', ''),
                         'selftext': post_data.get('selftext', ''),
                         'url': f"https://reddit.com{post_data.get('permalink', '')}",
                         'created_utc': post_data.get('created_utc', 0),
+                        'timestamp_ms': epoch_ms(post_data.get('created_utc'), received_ms),
                         'score': post_data.get('score', 0),
                         'num_comments': post_data.get('num_comments', 0),
                         'upvote_ratio': post_data.get('upvote_ratio', 0),
                         'author': post_data.get('author', ''),
-                        'subreddit': post_data.get('subreddit', ''),
+                        'subreddit': subreddit,
                         'id': post_data.get('id', ''),
                         'source': 'reddit'
                     })
@@ -197,124 +380,137 @@ class RedditAPI:
         return posts
     
     async def close(self):
-        await self.session.close()
+        await self.token_manager.close()
 
 class TwitterAPI:
-    def __init__(self):
-        self.session = aiohttp.ClientSession()
+    def __init__(self, http):
+        self.http = http
         self.last_request_time = 0
-        self.rate_limit_remaining = 450
-        self.rate_limit_reset = 0
         self.request_count = 0
-        self.rate_limit_wait_time = 0
-    
-    async def handle_rate_limit(self):
-        """Gerencia rate limit do Twitter de forma mais robusta"""
-        current_time = time.time()
-        
-        # Se estamos em período de espera por rate limit
-        if self.rate_limit_wait_time > current_time:
-            wait_remaining = self.rate_limit_wait_time - current_time
-            logger.warning(f"🐦 Rate limit Twitter - Aguardando {wait_remaining:.0f}s")
-            await asyncio.sleep(wait_remaining)
-            self.rate_limit_remaining = 450
-            self.rate_limit_wait_time = 0
-            return True
-        
-        # Verificar se estamos perto do limite
-        if self.rate_limit_remaining <= 10:
-            logger.warning(f"🐦 Rate limit baixo: {self.rate_limit_remaining} requests restantes")
-            # Esperar estratégicamente antes de fazer mais requests
-            await asyncio.sleep(30)
-            return True
-        
-        # Espera mínima entre requests para evitar rate limiting
-        time_since_last = current_time - self.last_request_time
-        if time_since_last < 3.0:
-            await asyncio.sleep(3.0 - time_since_last)
-        
-        return False
+        # Cota da janela de 15 min repartida entre ciclos e queries por rendimento
+        self.planner = QuotaPlanner(limit=450, window=900, cycle_seconds=180, max_pages=TWITTER_MAX_PAGES)
+        # newest_id por query, enviado como since_id na próxima busca
+        self.since_ids = {}
+        self.pending_pages = {}
     
-    async def search_tweets(self, query, limit=10):
-        """Busca tweets usando API v2 do Twitter - MELHORADO"""
+    async def search_tweets(self, query, limit=10, max_pages=TWITTER_MAX_PAGES):
+        """Busca só os tweets novos da query (since_id), paginando por next_token em bursts"""
         if not TWITTER_BEARER_TOKEN:
             return []
         
-        # Verificar rate limit antes de prosseguir
-        if await self.handle_rate_limit():
-            return []
-        
-        headers = {
-            'Authorization': f'Bearer {TWITTER_BEARER_TOKEN}'
-        }
-        
-        # Query otimizada para crypto
-        optimized_query = f'({query}) (crypto OR cryptocurrency OR blockchain OR defi OR nft) -is:retweet lang:en'
-        
-        url = 'https://api.twitter.com/2/tweets/search/recent'
+        # A query já vem pronta de build_twitter_queries (keywords + contexto crypto)
         params = {
-            'query': optimized_query,
-            'max_results': min(limit, 30),  # Reduzido para evitar rate limiting
+            'query': query,
+            'max_results': max(10, min(limit, 100)),  # A API v2 aceita de 10 a 100
             'tweet.fields': 'created_at,public_metrics,author_id,context_annotations',
             'expansions': 'author_id',
             'user.fields': 'username,name,verified',
             'media.fields': 'url'
         }
         
+        # Cursor por query: só tweets mais novos que o último já visto
+        since_id = self.since_ids.get(query)
+        if since_id:
+            params['since_id'] = since_id
+        
+        # Burst cortado em max_pages no poll anterior: retoma do next_token salvo, mesmo since_id
+        pending = self.pending_pages.get(query)
+        if pending:
+            params['next_token'] = pending['next_token']
+        
+        tweets = []
+        newest_id = pending['newest_id'] if pending else None
+        complete = True
+        for page in range(max_pages):
+            # Sem cota na janela: para sem dormir (o cursor antigo fica para o próximo ciclo)
+            if not self.planner.take():
+                complete = False
+                break
+            
+            data = await self.fetch_page(params)
+            if data is None:
+                complete = False
+                break
+            
+            meta = data.get('meta', {})
+            if newest_id is None:
+                newest_id = meta.get('newest_id')
+            tweets.extend(self.parse_tweets(data))
+            
+            # Primeira busca não pagina para trás; depois segue o next_token até alcançar o since_id
+            next_token = meta.get('next_token')
+            if not next_token or not since_id:
+                break
+            params['next_token'] = next_token
+        else:
+            logger.warning(f"🐦 Twitter: burst em '{query[:40]}...' passou de {max_pages} páginas")
+            # since_id só avança quando o resto do burst (até o since_id antigo) for buscado
+            self.pending_pages[query] = {'next_token': params['next_token'], 'newest_id': newest_id}
+            return tweets
+        
+        # Falha no meio da paginação: mantém o cursor antigo e repete na próxima
+        if newest_id and complete:
+            self.since_ids[query] = newest_id
+            self.pending_pages.pop(query, None)
+        
+        return tweets
+    
+    async def fetch_page(self, params):
+        """Uma página da busca recente; retorna o JSON ou None"""
+        headers = {
+            'Authorization': f'Bearer {TWITTER_BEARER_TOKEN}'
+        }
+        url = 'https://api.twitter.com/2/tweets/search/recent'
+        
         try:
             start_time = time.time()
-            async with self.session.get(
+            async with self.http.session.get(
                 url,
                 headers=headers,
                 params=params,
-                timeout=25
+                timeout=self.http.timeout(25)
             ) as response:
                 self.last_request_time = time.time()
                 self.request_count += 1
                 
-                # Atualizar métricas de rate limit
-                if 'x-rate-limit-remaining' in response.headers:
-                    self.rate_limit_remaining = int(response.headers['x-rate-limit-remaining'])
-                if 'x-rate-limit-reset' in response.headers:
-                    reset_time = int(response.headers['x-rate-limit-reset'])
-                    self.rate_limit_reset = reset_time
+                # Cota restante e reset da janela para o planejador
+                self.planner.update(response.headers)
                 
                 response_time = time.time() - start_time
                 
                 if response.status == 200:
                     data = await response.json()
-                    tweets = self.parse_tweets(data)
-                    logger.info(f"🐦 Twitter: {len(tweets)} tweets em {response_time:.2f}s")
-                    return tweets
+                    logger.info(f"🐦 Twitter: {data.get('meta', {}).get('result_count', 0)} tweets novos em {response_time:.2f}s")
+                    return data
                 
                 elif response.status == 429:
-                    # Rate limit excedido - calcular tempo de espera
+                    # Rate limit excedido - nenhuma request até o reset (sem dormir no loop)
                     reset_time = int(response.headers.get('x-rate-limit-reset', time.time() + 900))
-                    wait_time = max(reset_time - time.time(), 60)
-                    self.rate_limit_wait_time = time.time() + wait_time
+                    self.planner.block_until(reset_time)
                     
-                    logger.warning(f"🐦 Rate limit excedido! Aguardando {wait_time:.0f}s")
-                    return []
+                    logger.warning(f"🐦 Rate limit excedido! Cota volta em {max(reset_time - time.time(), 0):.0f}s")
+                    return None
                 
                 elif response.status == 400:
                     error_data = await response.json()
                     logger.warning(f"🐦 Twitter query error: {error_data.get('detail', 'Unknown')}")
-                    return []
+                    return None
                 
                 else:
                     logger.warning(f"🐦 Twitter error {response.status}")
-                    return []
+                    return None
                     
         except asyncio.TimeoutError:
             logger.warning("🐦 Twitter timeout - pulando busca")
-            return []
+            return None
         except Exception as e:
             logger.error(f"🐦 Twitter exception: {e}")
-            return []
+            return None
     
     def parse_tweets(self, data):
         """Parseia os tweets da API response"""
         tweets = []
+        received_ms = now_ms()
         
         if 'data' in data and isinstance(data['data'], list):
             users = {}
@@ -335,6 +531,7 @@ class TwitterAPI:
                     'text': tweet_data.get('text', ''),
                     'url': f"https://twitter.com/{author_info.get('username', '')}/status/{tweet_data.get('id', '')}",
                     'created_at': tweet_data.get('created_at', ''),
+                    'timestamp_ms': parse_iso8601_ms(tweet_data.get('created_at', ''), received_ms),
                     'likes': metrics.get('like_count', 0),
                     'retweets': metrics.get('retweet_count', 0),
                     'replies': metrics.get('reply_count', 0),
@@ -346,15 +543,26 @@ class TwitterAPI:
                 })
         
         return tweets
-    
-    async def close(self):
-        await self.session.close()
 
 class AlphaHunterBot:
     def __init__(self):
-        self.reddit_api = RedditAPI()
-        self.twitter_api = TwitterAPI()
-        self.vistos = set()
+        self.http = HttpClient(limit=HTTP_POOL_LIMIT, limit_per_host=HTTP_LIMIT_PER_HOST)
+        self.reddit_api = RedditAPI(self.http)
+        self.twitter_api = TwitterAPI(self.http)
+        self.telegram = TelegramSender(
+            self.http, TELEGRAM_TOKEN, CHAT_ID,
+            chat_per_minute=TELEGRAM_CHAT_PER_MINUTE,
+            global_per_second=TELEGRAM_GLOBAL_PER_SECOND
+        )
+        self.vistos = DedupStore(ttl=DEDUP_TTL_HOURS * 3600, bloom_capacity=DEDUP_BLOOM_CAPACITY)
+        # Cópias do mesmo texto (cross-posts, campanhas de shill) fundidas num item canônico
+        self.near_dups = NearDuplicateIndex(NEAR_DUP_WINDOW_HOURS * 3600, NEAR_DUP_THRESHOLD)
+        self.state = StateStore(STATE_DB_PATH)
+        self.pipeline = StreamPipeline(self.analyze_item, self.dispatch_opportunity, PIPELINE_QUEUE_SIZE, PIPELINE_WORKERS)
+        # Modo em lote: top-K por ciclo, excedente adiado para o próximo em vez de descartado
+        self.selector = TopKSelector(CANDIDATES_PER_CYCLE, CANDIDATE_SPILL_SIZE)
+        # Velocidade de menções por token (5 min / 1 h / 24 h) com memória limitada
+        self.trending = TrendingEngine(TRENDING_CAPACITY, TRENDING_VELOCITY, TRENDING_MIN_MENTIONS, TRENDING_COOLDOWN)
         self.keywords = [
             "presale", "launch", "new token", "meme coin",
             "fair launch", "stealth launch", "ido", 
@@ -363,128 +571,164 @@ class AlphaHunterBot:
             "moonshot", "100x", "low cap", "hidden gem",
             "#presale", "#launch", "#airdrop", "#ido"
         ]
+        self.keyword_matcher = KeywordMatcher(self.keywords)
+        self.pattern_engine = PatternEngine()
+        self.features = FeatureExtractor(self.keyword_matcher, self.pattern_engine)
+        
+        # Relevância calculada por lote (NumPy quando disponível)
+        self.scorer = BatchScorer(SCORING_MODE)
+        
+        # Keywords/padrões de lotes grandes em processos separados (ANALYSIS_MODE=process)
+        self.analysis = AnalysisExecutor(self.features, ANALYSIS_MODE, ANALYSIS_WORKERS or None, ANALYSIS_CHUNK_SIZE, ANALYSIS_MIN_CHARS)
+        
+        # Todas as keywords empacotadas no mínimo de buscas do Twitter (contexto crypto uma vez por query)
+        twitter_keywords = self.keywords + TWITTER_CASHTAGS
+        self.twitter_queries = build_twitter_queries(twitter_keywords, TWITTER_QUERY_MAX_LENGTH)
+        legacy_requests = legacy_twitter_requests(twitter_keywords)
+        logger.info(f"🐦 Twitter: {len(twitter_keywords)} keywords em {len(self.twitter_queries)} queries por ciclo "
+                    f"(grupos de 4 termos: {legacy_requests}, economia de {legacy_requests - len(self.twitter_queries)} requests)")
         self.safe_subreddits = [
             "CryptoCurrency", "CryptoMarkets", "defi",
             "ethereum", "binance", "Crypto_General",
             "NFT", "BlockchainStartups", "CryptoTechnology",
             "altcoin", "cryptomooncalls"
         ]
-        self.twitter_cycle = 0
+        # Cada subreddit/fonte no próprio intervalo, ajustado à taxa de itens novos
+        self.reddit_schedule = PollSchedule(unique_names(self.safe_subreddits), CHECK_INTERVAL, REDDIT_MIN_INTERVAL, REDDIT_MAX_INTERVAL, POLL_TARGET_ITEMS)
+        self.search_schedule = PollSchedule(['search'], CHECK_INTERVAL, REDDIT_MIN_INTERVAL, REDDIT_MAX_INTERVAL, POLL_TARGET_ITEMS)
+        self.twitter_schedule = PollSchedule(['twitter'], CHECK_INTERVAL, TWITTER_MIN_INTERVAL, TWITTER_MAX_INTERVAL, POLL_TARGET_ITEMS)
+        self.poll_tasks = []
     
     def send_telegram(self, message):
-        """Envia mensagem para Telegram"""
-        if not TELEGRAM_TOKEN or not CHAT_ID:
-            return False
-            
-        url = f"https://api.telegram.org/bot{TELEGRAM_TOKEN}/sendMessage"
-        payload = {
-            "chat_id": CHAT_ID, 
-            "text": message, 
-            "parse_mode": "HTML",
-            "disable_web_page_preview": True
-        }
+        """Enfileira mensagem para o Telegram (não bloqueia o loop)"""
+        return self.telegram.enqueue(message)
+    
+    async def fetch_reddit(self):
+        """Busca posts novos + keywords de todos os subreddits em poucos requests"""
+        # Mesmo sorteio de keywords para todos os subreddits, combinado em buscas OR
+        keywords = random.sample(self.keywords, min(3, len(self.keywords)))
         
-        try:
-            response = requests.post(url, json=payload, timeout=10)
-            return response.status_code == 200
-        except Exception as e:
-            logger.error(f"❌ Erro Telegram: {e}")
-            return False
+        new_posts, keyword_posts = await asyncio.gather(
+            self.reddit_api.get_new_posts_batch(self.safe_subreddits, limit=100),
+            self.reddit_api.search_posts_batch(self.safe_subreddits, keywords, limit=100)
+        )
+        return new_posts + keyword_posts
     
-    async def monitor_reddit(self):
-        """Monitora Reddit usando API oficial"""
-        posts = []
+    def claim_unseen(self, items, source):
+        """Itens ainda não vistos, já marcados como vistos (uma consulta por id)"""
+        fresh = []
+        for item in items:
+            item_id = f"{source}_{item.get('id', '')}"
+            if item_id in self.vistos:
+                continue
+            self.vistos.add(item_id)
+            fresh.append(item)
+        return fresh
+    
+    async def select_posts(self, batch):
+        """Posts ainda não vistos com keywords e engajamento mínimo"""
+        # Uma consulta ao vistos por post; o texto dos novos é analisado de uma vez (fora do loop no modo process)
+        fresh = self.claim_unseen(batch, 'reddit')
+        await self.analysis.prepare(fresh)
         
-        for subreddit in self.safe_subreddits:
+        posts = []
+        for post in fresh:
             try:
-                # Buscar posts novos
-                new_posts = await self.reddit_api.get_new_posts(subreddit, limit=10)
-                
-                # Buscar por keywords específicas
-                for keyword in random.sample(self.keywords, min(3, len(self.keywords))):
-                    keyword_posts = await self.reddit_api.search_posts(subreddit, keyword, limit=5)
-                    new_posts.extend(keyword_posts)
-                    await asyncio.sleep(1)  # Aumentado para reduzir rate limiting
+                # Texto normalizado e keywords calculados uma vez e guardados no item
+                features = self.features.extract(post, patterns=False)
+                found_keywords = features['keywords']
                 
-                for post in new_posts:
-                    post_id = f"reddit_{post.get('id', '')}"
-                    if post_id in self.vistos:
+                if found_keywords and post['score'] >= 2:
+                    item = {
+                        **post,
+                        'keywords': found_keywords,
+                        'keyword_lists': features['keyword_lists']
+                    }
+                    # Cópia de um post da janela (outro subreddit, repost): soma no canônico e só conta no trending
+                    if self.near_dups.merge(item, features['raw_text'], post['score'], f"r/{post['subreddit']}"):
+                        self.observe_copy(item)
                         continue
+                    posts.append(item)
                     
-                    self.vistos.add(post_id)
-                    
-                    text = f"{post['title']} {post['selftext']}".lower()
-                    
-                    # Verificar keywords
-                    found_keywords = []
-                    for keyword in self.keywords:
-                        if keyword.lower() in text:
-                            found_keywords.append(keyword)
-                    
-                    if found_keywords and post['score'] >= 2:
-                        posts.append({
-                            **post,
-                            'keywords': found_keywords,
-                            'relevance_score': len(found_keywords) + (post['score'] / 50) + (post['num_comments'] / 20)
-                        })
-                        
-                        logger.info(f"📝 Reddit: {post['title'][:60]}...")
-                
-                await asyncio.sleep(2)  # Aumentado para reduzir rate limiting
+                    logger.info(f"📝 Reddit: {post['title'][:60]}...")
                 
             except Exception as e:
                 logger.error(f"❌ Error monitoring Reddit: {e}")
                 continue
         
+        # Relevância de todos os posts selecionados de uma vez
+        for item, relevance in zip(posts, self.scorer.relevance(posts, 'reddit')):
+            item['relevance_score'] = relevance
         return posts
     
-    async def monitor_twitter(self):
-        """Monitora Twitter para oportunidades - MELHORADO"""
+    async def monitor_reddit(self):
+        """Monitora Reddit usando API oficial"""
+        posts = []
+        requests_before = self.reddit_api.request_budget.total_requests
+        
+        try:
+            new_posts = await self.fetch_reddit()
+        except Exception as e:
+            logger.error(f"❌ Error monitoring Reddit: {e}")
+            return posts
+        
+        posts = await self.select_posts(new_posts)
+        
+        requests_used = self.reddit_api.request_budget.total_requests - requests_before
+        logger.info(f"📡 Reddit: {len(new_posts)} posts em {requests_used} requests")
+        return posts
+    
+    async def monitor_twitter(self, emit=None):
+        """Monitora Twitter gastando a cota nas queries que mais rendem"""
         tweets = []
         
         if not TWITTER_BEARER_TOKEN:
             return tweets
         
-        # Buscar no Twitter a cada 3 ciclos para reduzir rate limiting
-        self.twitter_cycle += 1
-        if self.twitter_cycle % 3 != 0:
-            logger.info("🐦 Twitter: Pulando ciclo para reduzir rate limiting")
-            return tweets
-        
         try:
-            # Grupos de keywords otimizados (menos frequentes)
-            keyword_groups = [
-                "presale OR launch OR token OR airdrop",
-                "whitelist OR ido OR gem OR moonshot"
-            ]
+            # Fração da cota da janela que cabe neste ciclo, nas queries de maior rendimento
+            planner = self.twitter_api.planner
+            plan = planner.plan(self.twitter_queries)
+            if not plan:
+                logger.info(f"🐦 Twitter: sem cota neste ciclo ({planner.stats()['reset_in']}s para o reset)")
+                return tweets
             
-            for query in keyword_groups:
-                found_tweets = await self.twitter_api.search_tweets(query, limit=8)  # Reduzido
+            for query, pages in plan:
+                requests_before = self.twitter_api.request_count
+                found_tweets = await self.twitter_api.search_tweets(query, limit=100, max_pages=pages)
+                # Texto dos tweets novos analisado de uma vez (fora do loop no modo process)
+                fresh = self.claim_unseen(found_tweets, 'twitter')
+                await self.analysis.prepare(fresh)
+                selected = []
                 
-                for tweet in found_tweets:
-                    tweet_id = f"twitter_{tweet.get('id', '')}"
-                    if tweet_id in self.vistos:
-                        continue
-                    
-                    self.vistos.add(tweet_id)
-                    
-                    text = tweet['text'].lower()
-                    
-                    found_keywords = []
-                    for kw in self.keywords:
-                        if kw.lower() in text:
-                            found_keywords.append(kw)
+                for tweet in fresh:
+                    features = self.features.extract(tweet, patterns=False)
+                    found_keywords = features['keywords']
                     
                     if found_keywords and tweet['likes'] >= 3:  # Critério mais relaxado
-                        tweets.append({
+                        item = {
                             **tweet,
                             'keywords': found_keywords,
-                            'relevance_score': len(found_keywords) + (tweet['likes'] / 100) + (tweet['retweets'] / 50)
-                        })
+                            'keyword_lists': features['keyword_lists']
+                        }
+                        # Cópia de um post/tweet da janela: soma no canônico e só conta no trending
+                        if self.near_dups.merge(item, features['raw_text'], tweet['likes'], f"@{tweet['author']}"):
+                            self.observe_copy(item)
+                            continue
+                        selected.append(item)
                         
                         logger.info(f"🐦 Twitter: {tweet['text'][:60]}...")
                 
-                await asyncio.sleep(5)  # Aumentado para reduzir rate limiting
+                # Relevância da resposta inteira de uma vez
+                for item, relevance in zip(selected, self.scorer.relevance(selected, 'twitter')):
+                    item['relevance_score'] = relevance
+                    tweets.append(item)
+                    if emit:
+                        await emit(item)
+                
+                planner.record(query, self.twitter_api.request_count - requests_before, len(selected))
+            
+            logger.info(f"🐦 Cota Twitter: {planner.stats()}")
             
         except Exception as e:
             logger.error(f"❌ Error monitoring Twitter: {e}")
@@ -508,103 +752,106 @@ class AlphaHunterBot:
                 logger.error(f"Twitter monitoring failed: {twitter_tweets}")
                 twitter_tweets = []
             
-            all_content = reddit_posts + twitter_tweets
-            all_content.sort(key=lambda x: x['relevance_score'], reverse=True)
+            for item in reddit_posts + twitter_tweets:
+                self.selector.offer(item)
             
             logger.info(f"📊 Reddit: {len(reddit_posts)}, Twitter: {len(twitter_tweets)}")
-            return all_content[:20]  # Reduzido
+            # Top-K do ciclo; quem não coube fica na espera e entra no próximo
+            candidates = self.selector.take()
+            logger.info(f"📥 Seleção: {self.selector.stats()}")
+            return candidates
             
         except Exception as e:
             logger.error(f"❌ Error in monitor_sources: {e}")
             return []
     
-    def analyze_content(self, content_list):
-        """Analisa conteúdos para oportunidades"""
-        opportunities = []
-        token_mentions = {}
+    def score_content(self, content):
+        """Alerta de presale de um item (ou None)"""
+        # Registro de features já montado no monitor (texto, keywords, padrões)
+        features = self.features.extract(content)
         
-        for content in content_list:
-            text = ""
-            if content['source'] == 'reddit':
-                text = f"{content['title']} {content['selftext']}".lower()
-            else:
-                text = content['text'].lower()
-            
-            # Detectar padrões de presale
-            if self.detect_presale_patterns(text):
-                opportunities.append({
-                    'type': 'PRESALE_ALERT',
-                    'title': content.get('title', content.get('text', '')[:100]),
-                    'url': content['url'],
-                    'source': content['source'],
-                    'keywords': content['keywords'],
-                    'score': content.get('score', content.get('likes', 0)),
-                    'comments': content.get('num_comments', content.get('replies', 0)),
-                    'confidence': 'HIGH',
-                    'id': content['id']
-                })
-            
-            # Analisar menções de tokens
-            tokens = self.extract_tokens(text)
-            for token in tokens:
-                token_mentions[token] = token_mentions.get(token, 0) + 1
-        
-        # Adicionar tokens trending
-        for token, count in token_mentions.items():
-            if count >= 2:
+        # Detectar padrões de presale
+        if not features['presale']:
+            return None
+        
+        return {
+            'type': 'PRESALE_ALERT',
+            'title': content.get('title', content.get('text', '')[:100]),
+            'url': content['url'],
+            'source': content['source'],
+            'keywords': content['keywords'],
+            'score': content.get('score', content.get('likes', 0)),
+            'sources': content.get('sources', [content['source']]),
+            'total_engagement': content.get('total_engagement', content.get('score', content.get('likes', 0))),
+            'comments': content.get('num_comments', content.get('replies', 0)),
+            'confidence': 'HIGH',
+            'id': content['id']
+        }
+    
+    def trending_tokens(self, content):
+        """Passa os tokens do item pelo motor de trending; alertas dos que acabaram de acelerar"""
+        features = self.features.extract(content)
+        opportunities = []
+        for token in features['tokens']:
+            trend = self.trending.observe(token, features['posted_at_ms'] / 1000)
+            if trend:
                 opportunities.append({
                     'type': 'TRENDING_TOKEN',
                     'token': token,
-                    'mentions': count,
+                    'mentions': trend['mentions_5m'],
+                    'mentions_1h': trend['mentions_1h'],
+                    'velocity': trend['velocity'],
                     'source': 'multiple',
-                    'confidence': 'MEDIUM',
-                    'id': f"token_{token}"
+                    'confidence': 'HIGH' if trend['velocity'] >= 2 * TRENDING_VELOCITY else 'MEDIUM',
+                    'id': f"token_{token}_{int(trend['started_at'] // TRENDING_COOLDOWN)}"
                 })
+        return opportunities
+    
+    def observe_copy(self, content):
+        """Cópia fundida no canônico: sem análise própria, mas os tokens contam como menções"""
+        # Onda de shill copiada em vários lugares tem que pesar no trending como várias menções
+        for opportunity in self.trending_tokens(content):
+            self.dispatch_opportunity(opportunity)
+    
+    def analyze_content(self, content_list):
+        """Analisa conteúdos para oportunidades"""
+        opportunities = []
+        
+        for content in content_list:
+            opportunity = self.score_content(content)
+            if opportunity:
+                opportunities.append(opportunity)
+            opportunities.extend(self.trending_tokens(content))
         
         return opportunities
     
-    def detect_presale_patterns(self, text):
-        """Detecta padrões de presale"""
-        patterns = [
-            r'presale.*(live|start|begin|active|now)',
-            r'launch.*(tomorrow|today|tonight|soon|live)',
-            r'fair.*launch',
-            r'stealth.*launch',
-            r'token.*sale',
-            r'ido.*(starting|live|open|register)',
-            r'going.*live.*[0-9]',
-            r'whitelist.*(open|starting|join|register)',
-            r'airdrop.*(claim|live|participate|join)',
-            r'early.*access.*(open|available)'
-        ]
+    async def analyze_item(self, content):
+        """Estágio de análise do pipeline: oportunidades de um único item"""
+        opportunity = self.score_content(content)
+        return ([opportunity] if opportunity else []) + self.trending_tokens(content)
+    
+    def dispatch_opportunity(self, opp):
+        """Alerta a oportunidade se ainda não foi enviada; True se enfileirou"""
+        opp_id = f"{opp['type']}_{opp.get('id', '')}"
+        if opp_id in self.vistos:
+            return False
+        
+        self.vistos.add(opp_id)
         
-        for pattern in patterns:
-            if re.search(pattern, text, re.IGNORECASE):
-                return True
+        message = self.create_alpha_message(opp)
+        if self.send_telegram(message):
+            self.state.record_alert(opp_id, opp)
+            logger.info(f"✅ Alpha enfileirado: {opp['type']} from {opp.get('source', 'unknown')}")
+            return True
         return False
     
+    def detect_presale_patterns(self, text):
+        """Detecta padrões de presale"""
+        return self.pattern_engine.scan(text)['presale']
+    
     def extract_tokens(self, text):
         """Extrai tokens mencionados"""
-        patterns = [
-            r'\$([A-Z]{2,8})\b',
-            r'\b([A-Z]{3,8})\b.*(token|coin|launch|presale)',
-            r'(buy|get|trade).*\b([A-Z]{3,8})\b'
-        ]
-        
-        tokens = set()
-        for pattern in patterns:
-            matches = re.findall(pattern, text.upper())
-            for match in matches:
-                if isinstance(match, tuple):
-                    token = match[0] if len(match) > 0 and match[0] else (match[1] if len(match) > 1 else '')
-                else:
-                    token = match
-                
-                if (token and len(token) >= 2 and 
-                    token not in ["ETH", "BTC", "BNB", "USDT", "USDC", "USD", "THE", "AND", "FOR", "YOU"]):
-                    tokens.add(token)
-        
-        return list(tokens)
+        return self.pattern_engine.scan(text)['tokens']
     
     def create_alpha_message(self, opportunity):
         """Cria mensagem detalhada"""
@@ -614,6 +861,8 @@ class AlphaHunterBot:
             message += f"{source_emoji} <b>{opportunity['title']}</b>\n"
             message += f"🔗 <a href='{opportunity['url']}'>Ver conteúdo</a>\n"
             message += f"⭐ <b>Engajamento:</b> {opportunity['score']} ↑\n"
+            if len(opportunity['sources']) > 1:
+                message += f"🔁 <b>Copiado em:</b> {len(opportunity['sources'])} lugares ({', '.join(opportunity['sources'][:5])}), {opportunity['total_engagement']} ↑ no total\n"
             if opportunity['source'] == 'reddit':
                 message += f"💬 <b>Comentários:</b> {opportunity['comments']}\n"
             message += f"🔍 <b>Keywords:</b> {', '.join(opportunity['keywords'][:3])}\n\n"
@@ -622,7 +871,8 @@ class AlphaHunterBot:
         elif opportunity['type'] == 'TRENDING_TOKEN':
             message = f"📈 <b>TRENDING TOKEN - MULTIPLE SOURCES</b>\n\n"
             message += f"🏷 <b>Token:</b> ${opportunity['token']}\n"
-            message += f"🔊 <b>Mentions:</b> {opportunity['mentions']}\n"
+            message += f"🔊 <b>Mentions (5 min / 1 h):</b> {opportunity['mentions']} / {opportunity['mentions_1h']}\n"
+            message += f"⚡ <b>Velocidade:</b> {opportunity['velocity']}x a média de 24 h\n"
             message += f"🌐 <b>Source:</b> {opportunity['source']}\n\n"
             message += "📢 <b>Estou sendo muito mencionado!</b>\n"
             message += "🔍 <i>Possível lançamento em breve!</i>"
@@ -630,35 +880,113 @@ class AlphaHunterBot:
         message += f"\n\n⏰ <i>{datetime.now().strftime('%d/%m %H:%M:%S')}</i>"
         return message
     
+    async def run_cycle(self):
+        """Ciclo em lote (PIPELINE_MODE=batch); retorna (conteúdos analisados, oportunidades)"""
+        content = await self.monitor_sources()
+        opportunities = self.analyze_content(content)
+        for opp in opportunities:
+            self.dispatch_opportunity(opp)
+        return len(content), len(opportunities)
+    
+    async def poll_reddit_new(self, subreddits):
+        """Listings /new só dos subreddits vencidos; retorna os posts novos de cada um"""
+        counts = {}
+        
+        async def collect(batch):
+            for post in batch:
+                counts[post['subreddit']] = counts.get(post['subreddit'], 0) + 1
+            for item in await self.select_posts(batch):
+                await self.pipeline.put(item)
+        
+        await self.reddit_api.get_new_posts_batch(subreddits, limit=100, on_posts=collect)
+        return counts
+    
+    async def poll_reddit_search(self, keys):
+        """Buscas por keywords em todos os subreddits; retorna quantos posts relevantes eram novos"""
+        keywords = random.sample(self.keywords, min(3, len(self.keywords)))
+        found = []
+        
+        async def collect(batch):
+            for item in await self.select_posts(batch):
+                found.append(item)
+                await self.pipeline.put(item)
+        
+        await self.reddit_api.search_posts_batch(self.safe_subreddits, keywords, limit=100, on_posts=collect)
+        return {'search': len(found)}
+    
+    async def poll_twitter(self, keys):
+        """Twitter no próprio ritmo; o QuotaPlanner reparte a cota entre as queries"""
+        tweets = await self.monitor_twitter(emit=self.pipeline.put)
+        return {'twitter': len(tweets)}
+    
+    def start_pollers(self):
+        """Um loop independente por fonte, cada chave no próprio intervalo adaptativo"""
+        pollers = [
+            ('Reddit /new', self.reddit_schedule, self.poll_reddit_new),
+            ('Reddit busca', self.search_schedule, self.poll_reddit_search)
+        ]
+        if TWITTER_BEARER_TOKEN:
+            pollers.append(('Twitter', self.twitter_schedule, self.poll_twitter))
+        self.poll_tasks = [asyncio.create_task(poll_forever(name, schedule, poll)) for name, schedule, poll in pollers]
+    
+    def log_stats(self):
+        """Métricas de rede, filas, dedup, estado e pipeline"""
+        logger.info(f"🌐 HTTP pool: {self.http.stats()}")
+        logger.info(f"📨 Telegram: {self.telegram.stats()}")
+        logger.info(f"🧹 Dedup: {self.vistos.stats()}")
+        logger.info(f"🔁 Quase-duplicados: {self.near_dups.stats()}")
+        logger.info(f"💾 Estado: {self.state.stats()}")
+        logger.info(f"🚰 Pipeline: {self.pipeline.stats()}")
+        logger.info(f"📈 Trending: {self.trending.stats()}")
+        logger.info(f"🧮 Scoring: {self.scorer.stats()}")
+        logger.info(f"🧵 Análise: {self.analysis.stats()}")
+    
+    async def report_loop(self):
+        """Relatório periódico; as fontes rodam nos próprios loops"""
+        while True:
+            await asyncio.sleep(CHECK_INTERVAL)
+            try:
+                self.log_stats()
+                logger.info(f"⏱️  Intervalos Reddit: {self.reddit_schedule.stats()}")
+                logger.info(f"⏱️  Intervalos busca: {self.search_schedule.stats()}, Twitter: {self.twitter_schedule.stats()}")
+            except Exception as e:
+                logger.error(f"❌ Erro no relatório: {e}")
+    
     async def run(self):
         """Loop principal"""
         logger.info("🤖 Alpha Hunter Bot com Reddit + Twitter iniciado!")
         
-        self.send_telegram("🚀 <b>Alpha Hunter com Reddit + Twitter iniciado!</b>\n🔍 Monitoramento em tempo real\n🎯 Dados de múltiplas fontes")
+        # Sessão HTTP compartilhada criada já dentro do event loop
+        await self.http.start()
+        self.telegram.start()
+        self.pipeline.start()
+        self.analysis.start()
+        
+        # Dedup persistido: redeploy não reenvia o que já foi alertado
+        restored = await self.state.load_into(self.vistos)
+        self.state.start(self.vistos)
+        
+        if not restored:
+            self.send_telegram("🚀 <b>Alpha Hunter com Reddit + Twitter iniciado!</b>\n🔍 Monitoramento em tempo real\n🎯 Dados de múltiplas fontes")
+        
+        if PIPELINE_MODE != 'batch':
+            # Cada fonte no próprio loop e ritmo; aqui fica só o relatório periódico
+            self.start_pollers()
+            await self.report_loop()
+            return
         
         while True:
             try:
-                content = await self.monitor_sources()
-                opportunities = self.analyze_content(content)
+                content_count, opportunity_count = await self.run_cycle()
                 
-                logger.info(f"📊 Conteúdos analisados: {len(content)}")
-                logger.info(f"🎯 Oportunidades encontradas: {len(opportunities)}")
-                
-                for opp in opportunities:
-                    opp_id = f"{opp['type']}_{opp.get('id', '')}"
-                    
-                    if opp_id not in self.vistos:
-                        self.vistos.add(opp_id)
-                        
-                        message = self.create_alpha_message(opp)
-                        if self.send_telegram(message):
-                            logger.info(f"✅ Alpha enviado: {opp['type']} from {opp.get('source', 'unknown')}")
-                        await asyncio.sleep(1)
+                logger.info(f"📊 Conteúdos analisados: {content_count}")
+                logger.info(f"🎯 Oportunidades encontradas: {opportunity_count}")
+                self.log_stats()
                 
                 # Intervalo adaptativo baseado no número de oportunidades
                 base_wait = 180  # 3 minutos
-                if opportunities:
-                    base_wait = max(120, base_wait - len(opportunities) * 15)
+                if opportunity_count:
+                    base_wait = max(120, base_wait - opportunity_count * 15)
                 
                 wait_time = random.randint(base_wait, base_wait + 60)
                 logger.info(f"⏳ Próxima verificação em {wait_time//60} minutos...")
@@ -669,8 +997,14 @@ class AlphaHunterBot:
                 await asyncio.sleep(60)
     
     async def close(self):
+        for task in self.poll_tasks:
+            task.cancel()
+        await self.pipeline.close()
+        await self.analysis.close()
+        await self.telegram.close()
+        await self.state.close(self.vistos)
         await self.reddit_api.close()
-        await self.twitter_api.close()
+        await self.http.close()
 
 # Função principal
 async def main():
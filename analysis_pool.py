@@ -0,0 +1,109 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from features import item_text
+
+logger = logging.getLogger(__name__)
+
+# Matchers do processo worker, compilados uma vez no initializer
+_keyword_matcher = None
+_pattern_engine = None
+
+
+def _init_worker(keyword_matcher, pattern_engine):
+    global _keyword_matcher, _pattern_engine
+    _keyword_matcher = keyword_matcher
+    _pattern_engine = pattern_engine
+
+
+def _analyze_chunk(chunk):
+    """[(id, texto)] -> [(id, keywords, {lista: keywords}, padrões ou None)] dentro do worker"""
+    results = []
+    for item_id, raw_text in chunk:
+        text = raw_text.lower()
+        keywords, keyword_lists = _keyword_matcher.match_with_lists(text)
+        # Sem keyword o item é descartado pelos monitores: não vale varrer padrões
+        patterns = _pattern_engine.scan(text) if keywords else None
+        results.append((item_id, keywords, keyword_lists, patterns))
+    return results
+
+
+class AnalysisExecutor:
+    """Keywords e padrões de lotes de itens fora do event loop.
+
+    No modo `process` os textos de um lote vão em fatias de `chunk_size`
+    para um ProcessPoolExecutor cujos workers recebem o KeywordMatcher e o
+    PatternEngine já compilados uma vez (initializer); só voltam as
+    features compactas, guardadas em item['features'] como se tivessem sido
+    extraídas no próprio processo. Lotes com pouco texto, o modo `inline` e
+    qualquer falha do pool ficam com a extração normal no loop.
+    """
+
+    def __init__(self, features, mode='inline', workers=None, chunk_size=20, min_chars=4000):
+        self.features = features
+        self.mode = mode
+        self.workers = workers
+        self.chunk_size = max(1, chunk_size)
+        self.min_chars = min_chars
+        self.pool = None
+        self.batches = 0
+        self.items = 0
+        self.inline = 0
+        self.errors = 0
+
+    def start(self):
+        if self.mode != 'process' or self.pool is not None:
+            return
+        # spawn: o filho não herda threads nem o event loop do processo principal
+        self.pool = ProcessPoolExecutor(
+            self.workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(self.features.keyword_matcher, self.features.pattern_engine)
+        )
+        logger.info(f"🧵 Análise em {self.workers or os.cpu_count()} processos")
+
+    async def prepare(self, items):
+        """Calcula as features dos itens ainda sem registro (no pool, se compensar)"""
+        pending = [item for item in items if 'features' not in item]
+        if not pending:
+            return
+        texts = [item_text(item) for item in pending]
+        if self.pool is None or sum(len(text) for text in texts) < self.min_chars:
+            # Extração acontece sob demanda no loop, como no modo inline
+            self.inline += len(pending)
+            return
+
+        indexed = list(enumerate(texts))
+        chunks = [indexed[start:start + self.chunk_size] for start in range(0, len(indexed), self.chunk_size)]
+        loop = asyncio.get_running_loop()
+        try:
+            results = await asyncio.gather(*[loop.run_in_executor(self.pool, _analyze_chunk, chunk) for chunk in chunks])
+        except Exception as e:
+            self.errors += 1
+            self.inline += len(pending)
+            logger.error(f"❌ Erro no pool de análise, extraindo no loop: {e}")
+            return
+
+        for chunk_results in results:
+            for index, keywords, keyword_lists, patterns in chunk_results:
+                self.features.store(pending[index], texts[index], keywords, keyword_lists, patterns)
+        self.batches += 1
+        self.items += len(pending)
+
+    async def close(self):
+        if self.pool is not None:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            self.pool = None
+
+    def stats(self):
+        return {
+            'mode': 'process' if self.pool is not None else 'inline',
+            'batches': self.batches,
+            'pooled': self.items,
+            'inline': self.inline,
+            'errors': self.errors
+        }
@@ -0,0 +1,87 @@
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class TokenManager:
+    """Token OAuth com refresh single-flight e renovação antecipada em background.
+
+    `fetch` é uma coroutine sem argumentos que retorna (token, expires_in) ou
+    None em caso de falha. Chamadas concorrentes a get() com o token vencido
+    compartilham o mesmo refresh em andamento.
+    """
+
+    def __init__(self, fetch, refresh_margin=300, expiry_margin=60, retry_delay=30):
+        self.fetch = fetch
+        self.refresh_margin = refresh_margin
+        self.expiry_margin = expiry_margin
+        self.retry_delay = retry_delay
+        self.token = None
+        self.expires_at = 0.0
+        self.inflight = None
+        self.background_task = None
+        self.refreshes = 0
+        self.failures = 0
+
+    def valid(self):
+        return self.token is not None and time.monotonic() < self.expires_at
+
+    async def get(self):
+        """Token atual; só bloqueia quando não há token válido"""
+        if self.valid():
+            return self.token
+        return await self.refresh()
+
+    async def refresh(self):
+        """Dispara (ou reaproveita) o refresh em andamento"""
+        if self.inflight is None:
+            self.inflight = asyncio.ensure_future(self._refresh())
+        return await asyncio.shield(self.inflight)
+
+    async def _refresh(self):
+        try:
+            result = await self.fetch()
+            if not result:
+                self.failures += 1
+                self._schedule(self.retry_delay)
+                return self.token if self.valid() else None
+
+            token, expires_in = result
+            self.token = token
+            self.expires_at = time.monotonic() + max(expires_in - self.expiry_margin, 0)
+            self.refreshes += 1
+
+            # Renova antes do vencimento para o caminho dos requests nunca esperar
+            self._schedule(max(expires_in - self.refresh_margin, expires_in / 2))
+            return token
+        finally:
+            self.inflight = None
+
+    def _schedule(self, delay):
+        if self.background_task and not self.background_task.done():
+            self.background_task.cancel()
+        self.background_task = asyncio.ensure_future(self._refresh_later(delay))
+
+    async def _refresh_later(self, delay):
+        await asyncio.sleep(delay)
+        # Sai da referência antes de renovar para _schedule não cancelar a si mesma
+        self.background_task = None
+        try:
+            await self.refresh()
+        except Exception as e:
+            logger.error(f"❌ Erro no refresh do token em background: {e}")
+
+    async def close(self):
+        for task in (self.background_task, self.inflight):
+            if task and not task.done():
+                task.cancel()
+
+    def stats(self):
+        return {
+            'valid': self.valid(),
+            'expires_in': round(max(self.expires_at - time.monotonic(), 0), 1),
+            'refreshes': self.refreshes,
+            'failures': self.failures
+        }
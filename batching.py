@@ -0,0 +1,127 @@
+MAX_LISTING_PATH_LENGTH = 1800  # /r/a+b+c/new sem estourar o limite de URL
+MAX_LISTING_SUBREDDITS = 100
+MAX_SEARCH_QUERY_LENGTH = 512  # limite do parâmetro q da busca do Reddit
+MAX_TWITTER_QUERY_LENGTH = 512  # limite de query da busca recente (v2, planos básicos)
+TWITTER_CONTEXT_CLAUSE = '(crypto OR cryptocurrency OR blockchain OR defi OR nft) -is:retweet lang:en'
+LEGACY_TWITTER_GROUP_SIZE = 4  # termos por grupo OR no agrupamento fixo antigo
+
+
+def unique_names(names):
+    """Remove duplicados ignorando maiúsculas (r/CryptoMoonShots == r/cryptomoonshots)"""
+    seen = set()
+    unique = []
+    for name in names:
+        key = name.lower()
+        if key not in seen:
+            seen.add(key)
+            unique.append(name)
+    return unique
+
+
+def pack_terms(terms, separator, max_length, max_items=None):
+    """Agrupa termos em blocos cujo join(separator) cabe em max_length.
+
+    Um termo maior que max_length sozinho ainda vira um bloco próprio.
+    """
+    groups = []
+    current = []
+    current_length = 0
+    for term in terms:
+        extra = len(term) + (len(separator) if current else 0)
+        full = max_items is not None and len(current) >= max_items
+        if current and (current_length + extra > max_length or full):
+            groups.append(current)
+            current = []
+            current_length = 0
+            extra = len(term)
+        current.append(term)
+        current_length += extra
+    if current:
+        groups.append(current)
+    return groups
+
+
+def bin_pack_terms(terms, separator, max_length):
+    """Como pack_terms, mas first-fit decreasing: menos blocos, ordem não preservada"""
+    bins = []
+    for term in sorted(terms, key=len, reverse=True):
+        for group in bins:
+            if group[0] + len(separator) + len(term) <= max_length:
+                group[0] += len(separator) + len(term)
+                group[1].append(term)
+                break
+        else:
+            bins.append([len(term), [term]])
+    return [group for _, group in bins]
+
+
+def pack_subreddits(subreddits, max_length=MAX_LISTING_PATH_LENGTH, max_items=MAX_LISTING_SUBREDDITS):
+    """Divide subreddits em grupos para listings r/a+b+c"""
+    return pack_terms(unique_names(subreddits), '+', max_length, max_items)
+
+
+def format_search_term(keyword):
+    """Normaliza uma keyword para a sintaxe de busca (sem #, frases entre aspas)"""
+    term = keyword.strip().lstrip('#').strip()
+    if not term:
+        return ''
+    if ' ' in term:
+        return f'"{term}"'
+    return term
+
+
+def or_clause(terms):
+    if len(terms) == 1:
+        return terms[0]
+    return '(' + ' OR '.join(terms) + ')'
+
+
+def build_search_queries(subreddits, keywords, max_length=MAX_SEARCH_QUERY_LENGTH):
+    """Combina subreddits e keywords em buscas OR, dividindo quando q passa do limite.
+
+    Retorna uma lista de (subreddits_do_grupo, query).
+    """
+    terms = unique_names([t for t in (format_search_term(kw) for kw in keywords) if t])
+    subreddits = unique_names(subreddits)
+    if not terms or not subreddits:
+        return []
+
+    # Metade do espaço para keywords, o resto para os subreddits de cada grupo
+    keyword_groups = pack_terms(terms, ' OR ', max_length // 2 - 2)
+
+    queries = []
+    for keyword_group in keyword_groups:
+        keyword_clause = or_clause(keyword_group)
+        budget = max_length - len(keyword_clause) - 3
+        sub_terms = [f'subreddit:{name}' for name in subreddits]
+        for sub_group in pack_terms(sub_terms, ' OR ', budget):
+            names = [term[len('subreddit:'):] for term in sub_group]
+            queries.append((names, f'{or_clause(sub_group)} {keyword_clause}'))
+    return queries
+
+
+def twitter_search_terms(keywords):
+    """Keywords/hashtags/cashtags no formato da busca do Twitter (frases entre aspas)"""
+    terms = []
+    for keyword in keywords:
+        term = keyword.strip()
+        if not term:
+            continue
+        # # e $ são operadores da busca do Twitter e ficam como estão
+        terms.append(f'"{term}"' if ' ' in term else term)
+    return unique_names(terms)
+
+
+def build_twitter_queries(keywords, max_length=MAX_TWITTER_QUERY_LENGTH, context=TWITTER_CONTEXT_CLAUSE):
+    """Empacota todas as keywords no menor número de queries que cabem no limite.
+
+    A cláusula de contexto entra uma vez por query: (kw1 OR kw2 ...) <context>.
+    """
+    terms = twitter_search_terms(keywords)
+    budget = max_length - len(context) - 3
+    return [f'{or_clause(group)} {context}' for group in bin_pack_terms(terms, ' OR ', budget)]
+
+
+def legacy_twitter_requests(keywords):
+    """Requests para cobrir as mesmas keywords com grupos fixos de 4 termos"""
+    return -(-len(twitter_search_terms(keywords)) // LEGACY_TWITTER_GROUP_SIZE)
@@ -0,0 +1,93 @@
+"""Micro-benchmark: detectores regex antigos vs PatternEngine em selftext de ~40 KB.
+
+Uso: python benchmarks/bench_patterns.py
+"""
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pattern_engine import PatternEngine
+
+LEGACY_PRESALE = [
+    r'presale.*(live|start|begin|active|now)',
+    r'launch.*(tomorrow|today|tonight|soon|live)',
+    r'fair.*launch',
+    r'stealth.*launch',
+    r'token.*sale',
+    r'ido.*(starting|live|open|register)',
+    r'going.*live.*[0-9]',
+    r'whitelist.*(open|starting|join|register)',
+    r'airdrop.*(claim|live|participate|join)',
+    r'early.*access.*(open|available)'
+]
+
+LEGACY_IMMINENT = [
+    r'(launch|presale|going live).*(in\s+\d+\s*(hours|hrs|h|minutes|mins|m))',
+    r'(in\s+\d+\s*(hours|hrs|h|minutes|mins|m)).*(launch|presale|going live)',
+    r'(today|tonight|this (evening|afternoon|morning)|soon).*(launch|presale)',
+    r'(launch|presale).*(today|tonight|this (evening|afternoon|morning)|soon)',
+    r'\b(\d{1,2}:\d{2}\s*(AM|PM|UTC|GMT)?)\b.*(launch|presale|live)',
+    r'(launch|presale|live).*\b(\d{1,2}:\d{2}\s*(AM|PM|UTC|GMT)?)\b'
+]
+
+LEGACY_TOKENS = [
+    r'\$([A-Z]{2,8})\b',
+    r'\b([A-Z]{3,8})\b.*(token|coin|launch|presale)',
+    r'(buy|get|trade).*\b([A-Z]{3,8})\b'
+]
+
+
+def legacy_scan(text):
+    presale = any(re.search(p, text, re.IGNORECASE) for p in LEGACY_PRESALE)
+    imminent = any(re.search(p, text, re.IGNORECASE) for p in LEGACY_IMMINENT)
+    re.findall(r'in\s+(\d+)\s*(hours|hrs|h|minutes|mins|m)', text, re.IGNORECASE)
+    re.findall(r'\b(\d{1,2}:\d{2})\s*(AM|PM|UTC|GMT)?\b', text, re.IGNORECASE)
+    upper = text.upper()
+    for pattern in LEGACY_TOKENS:
+        re.findall(pattern, upper)
+    return presale, imminent
+
+
+def make_selftext(size, seed=42):
+    random.seed(seed)
+    words = (
+        "the community is building something big and we think this project has a real "
+        "roadmap with audits liquidity locks marketing partners and a doxxed team that "
+        "ships updates every week while holders wait patiently for the next milestone"
+    ).split()
+    parts = []
+    length = 0
+    while length < size:
+        word = random.choice(words)
+        parts.append(word)
+        length += len(word) + 1
+    text = ' '.join(parts)
+    # Algumas âncoras espalhadas, como num post real de shill
+    middle = len(text) // 2
+    return text[:middle] + ' presale of $PEPE starts in 2 hours at 14:00 UTC ' + text[middle:]
+
+
+def bench(fn, text, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(text)
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    engine = PatternEngine()
+    for size, repeat in ((280, 2000), (2000, 500), (40000, 5)):
+        text = make_selftext(size)
+        legacy = bench(legacy_scan, text.lower(), repeat)
+        # _scan direto: scan() devolveria o resultado em cache do texto repetido
+        engine_time = bench(engine._scan, text.lower(), repeat)
+        print(f"{size:>6} bytes  legacy {legacy * 1e6:>12.1f} us/doc  engine {engine_time * 1e6:>9.1f} us/doc  "
+              f"({legacy / engine_time:.0f}x)")
+
+
+if __name__ == '__main__':
+    main()
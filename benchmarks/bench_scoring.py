@@ -0,0 +1,59 @@
+"""Micro-benchmark: relevância/urgência por item vs BatchScorer em lotes de vários tamanhos.
+
+Uso: python benchmarks/bench_scoring.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from features import now_ms
+from scoring import ENGAGEMENT_DIVISORS, BatchScorer, np, relevance_score, urgency_score
+
+
+def make_items(count, seed=42):
+    random.seed(seed)
+    now = now_ms()
+    items = []
+    for _ in range(count):
+        imminent = random.random() < 0.05
+        time_info = {'estimated_hours': random.randint(1, 8)} if imminent and random.random() < 0.5 else {}
+        items.append({
+            'score': random.randint(2, 900),
+            'num_comments': random.randint(0, 300),
+            'features': {
+                'keywords': ['memecoin'] * random.randint(1, 4),
+                'imminent': imminent,
+                'time_info': time_info,
+                'posted_at_ms': now - random.randint(0, 86_400_000)
+            }
+        })
+    return items
+
+
+def bench(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    scorer = BatchScorer('numpy')
+    divisors = ENGAGEMENT_DIVISORS['reddit']
+    print(f"numpy: {'sim' if np is not None else 'não'}")
+    for size, repeat in ((25, 2000), (500, 200), (5000, 20)):
+        items = make_items(size)
+        features = [item['features'] for item in items]
+        per_item = bench(lambda: [relevance_score(item, divisors) for item in items], repeat)
+        batch = bench(lambda: scorer.relevance(items, 'reddit'), repeat)
+        urgency_item = bench(lambda: [urgency_score(f, now_ms()) for f in features], repeat)
+        urgency_batch = bench(lambda: scorer.urgency(features), repeat)
+        print(f"{size:>5} itens  relevância {per_item * 1e6:>8.1f} -> {batch * 1e6:>8.1f} us  "
+              f"urgência {urgency_item * 1e6:>8.1f} -> {urgency_batch * 1e6:>8.1f} us")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,286 @@
+import hashlib
+import math
+import random
+import re
+import sys
+import time
+from collections import deque
+
+URL = re.compile(r'https?://\S+|www\.\S+')
+NON_WORD = re.compile(r'[^a-z0-9$]+')
+MERSENNE_61 = (1 << 61) - 1
+
+
+def compact_key(item_id):
+    """ID de 64 bits (blake2b) no lugar da f-string original"""
+    return int.from_bytes(hashlib.blake2b(item_id.encode(), digest_size=8).digest(), 'big')
+
+
+def minhash(text, permutations, max_chars=3000):
+    """(assinatura MinHash, cashtags) do começo do texto normalizado; assinatura None se não houver palavras"""
+    words = NON_WORD.sub(' ', URL.sub(' ', text[:max_chars].lower())).split()
+    tickers = frozenset(word for word in words if word.startswith('$'))
+    hashes = {compact_key(word) for word in words}
+    if not hashes:
+        return None, tickers
+    # Permutações (a*h + b) mod p: o mínimo de cada uma estima a similaridade de Jaccard
+    signature = tuple(
+        min((a * h + b) % MERSENNE_61 for h in hashes)
+        for a, b in permutations
+    )
+    return signature, tickers
+
+
+class BloomFilter:
+    """Bloom filter de tamanho fixo sobre chaves inteiras de 64 bits"""
+
+    def __init__(self, capacity, error_rate=0.01):
+        self.capacity = capacity
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key):
+        # Double hashing: as duas metades da chave geram os k índices
+        h1 = key & 0xFFFFFFFF
+        h2 = (key >> 32) | 1
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, key):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key):
+        for position in self._positions(key):
+            if not self.bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    @property
+    def full(self):
+        return self.count >= self.capacity
+
+
+class DedupStore:
+    """Conjunto de IDs já vistos com expiração por baldes de tempo.
+
+    Substitui o antigo `set` de f-strings que crescia para sempre: as chaves
+    são inteiros de 64 bits, cada add() cai no balde do instante atual e os
+    baldes mais velhos que `ttl` são descartados inteiros. Opcionalmente as
+    chaves expiradas passam para um Bloom filter (duas gerações de tamanho
+    fixo), que segura IDs muito antigos com memória constante.
+    """
+
+    def __init__(self, ttl=86400, buckets=24, max_keys=500000, bloom_capacity=0, bloom_error=0.01,
+                 journal=None):
+        self.ttl = ttl
+        self.bucket_span = ttl / buckets
+        self.max_keys = max_keys
+        self.index = {}
+        self.buckets = deque()
+        self.bloom_capacity = bloom_capacity
+        self.bloom_error = bloom_error
+        self.blooms = deque([BloomFilter(bloom_capacity, bloom_error)]) if bloom_capacity else deque()
+        self.lookups = 0
+        self.hits = 0
+        self.bloom_hits = 0
+        self.expired = 0
+        # Callback (key, seen_at) para persistir cada add(); ver StateStore
+        self.journal = journal
+
+    def _bucket_id(self, now):
+        return int(now // self.bucket_span)
+
+    def _expire(self, now):
+        oldest_allowed = self._bucket_id(now - self.ttl)
+        while self.buckets and (self.buckets[0][0] <= oldest_allowed or len(self.index) > self.max_keys):
+            bucket_id, keys = self.buckets.popleft()
+            for key in keys:
+                # Chaves revistas depois foram para um balde mais novo
+                if self.index.get(key) == bucket_id:
+                    del self.index[key]
+                    self.expired += 1
+                    self._remember(key)
+
+    def _remember(self, key):
+        if not self.blooms:
+            return
+        if self.blooms[-1].full:
+            self.blooms.append(BloomFilter(self.bloom_capacity, self.bloom_error))
+            if len(self.blooms) > 2:
+                self.blooms.popleft()
+        self.blooms[-1].add(key)
+
+    def __contains__(self, item_id):
+        now = time.time()
+        self._expire(now)
+        key = compact_key(item_id)
+        self.lookups += 1
+        if key in self.index:
+            self.hits += 1
+            return True
+        for bloom in self.blooms:
+            if key in bloom:
+                self.hits += 1
+                self.bloom_hits += 1
+                return True
+        return False
+
+    def add(self, item_id):
+        now = time.time()
+        self._expire(now)
+        key = compact_key(item_id)
+        bucket_id = self._bucket_id(now)
+        if not self.buckets or self.buckets[-1][0] != bucket_id:
+            self.buckets.append((bucket_id, []))
+        if self.index.get(key) != bucket_id:
+            self.index[key] = bucket_id
+            self.buckets[-1][1].append(key)
+            if self.journal:
+                self.journal(key, now)
+
+    def restore(self, entries, blooms=()):
+        """Recarrega chaves persistidas (key, seen_at) em ordem de seen_at e os bits do Bloom"""
+        oldest_allowed = self._bucket_id(time.time() - self.ttl)
+        for key, seen_at in entries:
+            bucket_id = self._bucket_id(seen_at)
+            if bucket_id <= oldest_allowed:
+                continue
+            if not self.buckets or self.buckets[-1][0] != bucket_id:
+                self.buckets.append((bucket_id, []))
+            self.index[key] = bucket_id
+            self.buckets[-1][1].append(key)
+
+        if self.bloom_capacity and blooms:
+            self.blooms.clear()
+            for count, bits in blooms:
+                bloom = BloomFilter(self.bloom_capacity, self.bloom_error)
+                if len(bits) == len(bloom.bits):
+                    bloom.bits[:] = bits
+                    bloom.count = count
+                    self.blooms.append(bloom)
+            if not self.blooms:
+                self.blooms.append(BloomFilter(self.bloom_capacity, self.bloom_error))
+
+    def bloom_state(self):
+        return [(bloom.count, bytes(bloom.bits)) for bloom in self.blooms]
+
+    def __len__(self):
+        return len(self.index)
+
+    def memory_bytes(self):
+        total = sys.getsizeof(self.index) + len(self.index) * sys.getsizeof(1 << 63)
+        total += sum(sys.getsizeof(keys) for _, keys in self.buckets)
+        total += sum(len(bloom.bits) for bloom in self.blooms)
+        return total
+
+    def stats(self):
+        return {
+            'keys': len(self.index),
+            'buckets': len(self.buckets),
+            'lookups': self.lookups,
+            'hit_rate': round(self.hits / self.lookups, 3) if self.lookups else 0,
+            'bloom_hits': self.bloom_hits,
+            'expired': self.expired,
+            'memory_kb': round(self.memory_bytes() / 1024, 1)
+        }
+
+
+class NearDuplicateIndex:
+    """Cópias (quase) idênticas do mesmo texto dentro de uma janela de tempo.
+
+    Cada item relevante vira uma assinatura MinHash das palavras do texto
+    normalizado (sem URLs, pontuação e maiúsculas), dividida em faixas de
+    `rows` valores indexadas por valor exato (LSH): só itens que dividem
+    alguma faixa são comparados, e a cópia precisa ter similaridade
+    estimada >= `threshold` e as mesmas cashtags (o mesmo texto com outro
+    token é outro lançamento). O primeiro item de cada texto fica como
+    canônico; as cópias seguintes somam engajamento e origem nele e não
+    seguem para análise nem alerta. Entradas mais velhas que `window`
+    saem do índice.
+    """
+
+    def __init__(self, window=21600, threshold=0.7, permutations=32, rows=4, min_words=8,
+                 max_items=20000, seed=1):
+        self.window = window
+        self.threshold = threshold
+        self.rows = rows
+        self.min_words = min_words
+        self.max_items = max_items
+        generator = random.Random(seed)
+        self.permutations = [
+            (generator.randrange(1, MERSENNE_61), generator.randrange(MERSENNE_61))
+            for _ in range(permutations - permutations % rows)
+        ]
+        self.tables = [{} for _ in range(len(self.permutations) // rows)]
+        self.entries = deque()
+        self.checked = 0
+        self.merged = 0
+
+    def _band_keys(self, signature):
+        return [signature[start:start + self.rows] for start in range(0, len(signature), self.rows)]
+
+    def _expire(self, now):
+        while self.entries and (self.entries[0][0] < now - self.window or len(self.entries) > self.max_items):
+            _, signature, _, item = self.entries.popleft()
+            for table, key in zip(self.tables, self._band_keys(signature)):
+                bucket = table.get(key)
+                if bucket is None:
+                    continue
+                bucket[:] = [entry for entry in bucket if entry[2] is not item]
+                if not bucket:
+                    del table[key]
+
+    def _find(self, signature, tickers, keys):
+        compared = set()
+        for table, key in zip(self.tables, keys):
+            for candidate, candidate_tickers, item in table.get(key, ()):
+                if id(item) in compared:
+                    continue
+                compared.add(id(item))
+                if candidate_tickers != tickers:
+                    continue
+                same = sum(1 for x, y in zip(candidate, signature) if x == y)
+                if same >= self.threshold * len(signature):
+                    return item
+        return None
+
+    def merge(self, item, text, engagement, source, now=None):
+        """Registra o item; se for cópia de um canônico da janela, soma nele e retorna o canônico"""
+        now = time.time() if now is None else now
+        self._expire(now)
+        item['sources'] = [source]
+        item['total_engagement'] = engagement
+        # Textos curtos demais ("presale live now!") coincidem por acaso
+        if len(text.split(None, self.min_words)) < self.min_words:
+            return None
+        signature, tickers = minhash(text, self.permutations)
+        if signature is None:
+            return None
+
+        self.checked += 1
+        keys = self._band_keys(signature)
+        canonical = self._find(signature, tickers, keys)
+        if canonical is not None:
+            self.merged += 1
+            # Mesma conta/subreddit repostando conta uma vez só na lista de lugares
+            if source not in canonical['sources']:
+                canonical['sources'].append(source)
+            canonical['total_engagement'] += engagement
+            return canonical
+
+        for table, key in zip(self.tables, keys):
+            table.setdefault(key, []).append((signature, tickers, item))
+        self.entries.append((now, signature, tickers, item))
+        return None
+
+    def stats(self):
+        return {
+            'tracked': len(self.entries),
+            'checked': self.checked,
+            'merged': self.merged,
+            'merge_rate': round(self.merged / self.checked, 3) if self.checked else 0
+        }
@@ -0,0 +1,88 @@
+import aiohttp
+
+
+class HttpClient:
+    """Sessão aiohttp única do bot (Reddit, Twitter e Telegram).
+
+    Pool com keep-alive, cache de DNS e limite de conexões por host. A sessão
+    é criada em start(), já dentro do event loop, e reutilizada por todas as
+    fontes e destinos.
+    """
+
+    def __init__(self, limit=100, limit_per_host=20, dns_ttl=300, keepalive=30,
+                 connect_timeout=10, read_timeout=20, total_timeout=30):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.dns_ttl = dns_ttl
+        self.keepalive = keepalive
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.total_timeout = total_timeout
+        self.session = None
+        self.connector = None
+        self.timeouts = {}
+        self.counters = {
+            'requests': 0,
+            'connections_created': 0,
+            'connections_reused': 0,
+            'dns_cache_hits': 0,
+            'dns_cache_misses': 0
+        }
+
+    async def start(self):
+        """Cria o pool e a sessão (idempotente)"""
+        if self.session is not None and not self.session.closed:
+            return self.session
+
+        self.connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            ttl_dns_cache=self.dns_ttl,
+            use_dns_cache=True,
+            keepalive_timeout=self.keepalive,
+            enable_cleanup_closed=True
+        )
+        self.session = aiohttp.ClientSession(
+            connector=self.connector,
+            timeout=self.timeout(self.total_timeout),
+            trace_configs=[self._trace_config()]
+        )
+        return self.session
+
+    def timeout(self, total):
+        """ClientTimeout estruturado (total/connect/sock_read), reaproveitado por valor"""
+        if total not in self.timeouts:
+            self.timeouts[total] = aiohttp.ClientTimeout(
+                total=total,
+                connect=min(self.connect_timeout, total),
+                sock_read=min(self.read_timeout, total)
+            )
+        return self.timeouts[total]
+
+    def _trace_config(self):
+        trace = aiohttp.TraceConfig()
+
+        def counter(name):
+            async def increment(session, context, params):
+                self.counters[name] += 1
+            return increment
+
+        trace.on_request_start.append(counter('requests'))
+        trace.on_connection_create_end.append(counter('connections_created'))
+        trace.on_connection_reuseconn.append(counter('connections_reused'))
+        trace.on_dns_cache_hit.append(counter('dns_cache_hits'))
+        trace.on_dns_cache_miss.append(counter('dns_cache_misses'))
+        return trace
+
+    def stats(self):
+        stats = dict(self.counters)
+        if self.connector is not None:
+            stats['limit'] = self.connector.limit
+            stats['limit_per_host'] = self.connector.limit_per_host
+            stats['in_use'] = len(self.connector._acquired)
+            stats['idle'] = sum(len(conns) for conns in self.connector._conns.values())
+        return stats
+
+    async def close(self):
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
@@ -0,0 +1,87 @@
+from collections import deque
+
+
+class KeywordMatcher:
+    """Aho–Corasick compilado uma vez para todas as listas de keywords.
+
+    Mesma semântica do antigo `kw.lower() in text` (substring, sem diferenciar
+    maiúsculas), mas com uma única passada linear pelo texto, independente
+    do número de keywords. Cada hit sabe de quais listas veio.
+    """
+
+    def __init__(self, keyword_lists):
+        if not isinstance(keyword_lists, dict):
+            keyword_lists = {'keywords': keyword_lists}
+
+        self.keywords = []
+        self.sources = []
+        index = {}
+        for name, words in keyword_lists.items():
+            for word in words:
+                key = word.lower()
+                if not key:
+                    continue
+                if key not in index:
+                    index[key] = len(self.keywords)
+                    self.keywords.append(word)
+                    self.sources.append([])
+                if name not in self.sources[index[key]]:
+                    self.sources[index[key]].append(name)
+
+        self._build([word.lower() for word in self.keywords])
+
+    def _build(self, words):
+        # Trie
+        goto = [{}]
+        outputs = [set()]
+        for i, word in enumerate(words):
+            state = 0
+            for ch in word:
+                if ch not in goto[state]:
+                    goto.append({})
+                    outputs.append(set())
+                    goto[state][ch] = len(goto) - 1
+                state = goto[state][ch]
+            outputs[state].add(i)
+
+        # Links de falha em BFS e transições completas (DFA): um lookup por caractere
+        fail = [0] * len(goto)
+        delta = [None] * len(goto)
+        delta[0] = dict(goto[0])
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, child in goto[state].items():
+                queue.append(child)
+                fail[child] = delta[fail[state]].get(ch, 0) if state else 0
+                outputs[child] |= outputs[fail[child]]
+            delta[state] = {**delta[fail[state]], **goto[state]} if state else delta[0]
+
+        self.delta = delta
+        self.outputs = [tuple(sorted(out)) for out in outputs]
+
+    def find(self, text):
+        """Índices (em self.keywords) de todas as keywords presentes no texto"""
+        delta = self.delta
+        outputs = self.outputs
+        state = 0
+        hits = set()
+        for ch in text.lower():
+            state = delta[state].get(ch, 0)
+            if outputs[state]:
+                hits.update(outputs[state])
+        return hits
+
+    def match(self, text):
+        """Keywords encontradas, na ordem em que foram registradas"""
+        return [self.keywords[i] for i in sorted(self.find(text))]
+
+    def match_with_lists(self, text):
+        """(keywords encontradas, {lista de origem: keywords}) numa única passada"""
+        found = []
+        grouped = {}
+        for i in sorted(self.find(text)):
+            found.append(self.keywords[i])
+            for name in self.sources[i]:
+                grouped.setdefault(name, []).append(self.keywords[i])
+        return found, grouped
@@ -0,0 +1,200 @@
+import re
+
+# Radicais reconhecidos pelo scanner (casam com sufixos: launch -> launching/launched)
+STEM_TAGS = {
+    'presale': ('PRESALE', 'SALE'),
+    'launch': ('LAUNCH',),
+    'live': ('LIVE',),
+    'going': ('GOING',),
+    'fair': ('FAIR',),
+    'stealth': ('STEALTH',),
+    'token': ('TOKEN',),
+    'sale': ('SALE',),
+    'ido': ('IDO',),
+    'whitelist': ('WHITELIST',),
+    'airdrop': ('AIRDROP',),
+    'early': ('EARLY',),
+    'access': ('ACCESS',),
+    'start': ('START',),
+    'begin': ('START',),
+    'active': ('ACTIVE',),
+    'now': ('NOW',),
+    'tomorrow': ('TOMORROW',),
+    'today': ('TODAY',),
+    'tonight': ('TONIGHT',),
+    'soon': ('SOON',),
+    'open': ('OPEN',),
+    'register': ('REGISTER',),
+    'join': ('JOIN',),
+    'claim': ('CLAIM',),
+    'participate': ('PARTICIPATE',),
+    'available': ('AVAILABLE',),
+}
+
+
+def trie_pattern(words):
+    """Alternação fatorada por prefixo (o regex não testa cada palavra em cada posição)"""
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+
+    def build(node):
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return '(?:' + body + ')?' if '' in node else body
+
+    return build(trie)
+
+
+SCANNER = re.compile(
+    r'\b(?:'
+    r'(?P<going_live>going\s+live)'
+    r'|(?P<this_part>this\s+(?:evening|afternoon|morning))'
+    r'|(?P<clock>\d{1,2}:\d{2})(?:\s*(?P<zone>am|pm|utc|gmt)\b)?'
+    r'|(?P<word>' + trie_pattern(STEM_TAGS) + r')\w*'
+    r'|(?P<digit>\d)\d*'
+    r')'
+    # Sem \b no fim, como o regex antigo: "in 30 min", "in 2hr", "in 5mins"
+    r'|in\s+(?P<amount>\d+)\s*(?P<unit>hours|hrs|hr|h|minutes|mins|min|m)'
+    r'|\$(?P<ticker>[a-z]{2,8})\b',
+    re.IGNORECASE
+)
+
+EXCLUDED_TOKENS = {"ETH", "BTC", "BNB", "USDT", "USDC", "USD", "THE", "AND", "FOR", "YOU"}
+
+LIVE_NOW = {'LIVE', 'START', 'ACTIVE', 'NOW'}
+SOON_WORDS = {'TODAY', 'TONIGHT', 'THIS_PART', 'SOON'}
+
+# Cada regra é uma sequência de conjuntos de tags que devem aparecer nesta ordem
+# dentro da janela de proximidade (substitui os antigos `.*` sem limite)
+RULES = {
+    'presale': [
+        ({'PRESALE'}, LIVE_NOW),
+        ({'LAUNCH'}, {'TOMORROW', 'TODAY', 'TONIGHT', 'SOON', 'LIVE'}),
+        ({'FAIR'}, {'LAUNCH'}),
+        ({'STEALTH'}, {'LAUNCH'}),
+        ({'TOKEN'}, {'SALE'}),
+        ({'IDO'}, {'START', 'LIVE', 'OPEN', 'REGISTER'}),
+        ({'GOING'}, {'LIVE'}, {'DIGIT'}),
+        ({'WHITELIST'}, {'OPEN', 'START', 'JOIN', 'REGISTER'}),
+        ({'AIRDROP'}, {'CLAIM', 'LIVE', 'PARTICIPATE', 'JOIN'}),
+        ({'EARLY'}, {'ACCESS'}, {'OPEN', 'AVAILABLE'}),
+    ],
+    'imminent': [
+        ({'LAUNCH', 'PRESALE', 'GOING_LIVE'}, {'DURATION'}),
+        ({'DURATION'}, {'LAUNCH', 'PRESALE', 'GOING_LIVE'}),
+        (SOON_WORDS, {'LAUNCH', 'PRESALE'}),
+        ({'LAUNCH', 'PRESALE'}, SOON_WORDS),
+        ({'CLOCK'}, {'LAUNCH', 'PRESALE', 'LIVE'}),
+        ({'LAUNCH', 'PRESALE', 'LIVE'}, {'CLOCK'}),
+    ],
+}
+
+
+class PatternEngine:
+    """Scanner único e linear para presale / lançamento iminente / horário / tokens.
+
+    Uma só passada de `finditer` transforma o texto em eventos (palavras-chave,
+    "in 2 hours", "14:00 UTC", "$TICKER", dígitos) e todas as regras são
+    avaliadas sobre esses eventos com janelas de proximidade limitadas, sem o
+    backtracking quadrático dos padrões `a.*b` antigos.
+    """
+
+    def __init__(self, window=100):
+        self.window = window
+        self.rules = []
+        self.rule_families = []
+        self.by_tag = {}
+        for family, rules in RULES.items():
+            for rule in rules:
+                index = len(self.rules)
+                self.rules.append(rule)
+                self.rule_families.append(family)
+                for position, tags in enumerate(rule):
+                    for tag in tags:
+                        self.by_tag.setdefault(tag, []).append((index, position))
+        for steps in self.by_tag.values():
+            steps.sort(key=lambda step: step[1])
+        # Os detectores são chamados em sequência sobre o mesmo texto
+        self.last_text = None
+        self.last_result = None
+
+    def _event_tags(self, match):
+        kind = match.lastgroup
+        if kind == 'word':
+            return STEM_TAGS[match.group('word').lower()]
+        if kind == 'going_live':
+            return ('GOING', 'LIVE', 'GOING_LIVE')
+        if kind == 'this_part':
+            return ('THIS_PART',)
+        if kind == 'unit':
+            return ('DURATION', 'DIGIT')
+        if kind in ('clock', 'zone'):
+            return ('CLOCK', 'DIGIT')
+        if kind == 'digit':
+            return ('DIGIT',)
+        return ()
+
+    def scan(self, text):
+        """Todos os detectores numa passada: presale, imminent, time_info e tokens"""
+        if text is self.last_text or text == self.last_text:
+            return self.last_result
+        result = self._scan(text)
+        self.last_text = text
+        self.last_result = result
+        return result
+
+    def _scan(self, text):
+        window = self.window
+        partial = [[None] * len(rule) for rule in self.rules]
+        matched = {family: False for family in RULES}
+        time_info = {}
+        tokens = []
+
+        for match in SCANNER.finditer(text):
+            start = match.start()
+            kind = match.lastgroup
+
+            if kind == 'ticker':
+                tokens.append(match.group('ticker').upper())
+                continue
+
+            tags = self._event_tags(match)
+
+            if 'DURATION' in tags and 'estimated_hours' not in time_info and 'estimated_minutes' not in time_info:
+                amount = int(match.group('amount'))
+                unit = match.group('unit').lower()
+                if 'hour' in unit or 'h' in unit:
+                    time_info['estimated_hours'] = amount
+                else:
+                    time_info['estimated_minutes'] = amount
+            elif 'CLOCK' in tags and 'specific_time' not in time_info:
+                zone = match.group('zone')
+                time_info['specific_time'] = match.group('clock') + (f" {zone.upper()}" if zone else "")
+
+            steps = []
+            for tag in tags:
+                steps.extend(self.by_tag.get(tag, ()))
+            steps.sort(key=lambda step: step[1])
+            for index, position in steps:
+                if matched[self.rule_families[index]]:
+                    continue
+                state = partial[index]
+                if position == 0:
+                    state[0] = start
+                elif state[position - 1] is not None and start - state[position - 1] <= window:
+                    state[position] = state[position - 1]
+                    if position == len(state) - 1:
+                        matched[self.rule_families[index]] = True
+
+        return {
+            'presale': matched['presale'],
+            'imminent': matched['imminent'],
+            'time_info': time_info,
+            'tokens': list(dict.fromkeys(t for t in tokens if t not in EXCLUDED_TOKENS))
+        }
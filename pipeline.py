@@ -0,0 +1,187 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections import deque
+
+from features import item_timestamp_ms
+
+logger = logging.getLogger(__name__)
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+class TopKSelector:
+    """Os K itens mais relevantes de cada fatia, sem descartar o excedente em silêncio.
+
+    offer() mantém um min-heap limitado a K enquanto os itens chegam
+    (O(log K) por item, sem ordenar tudo). Quem perde o lugar vai para a
+    fila de espera, também limitada e ordenada por relevância, e abre a
+    próxima fatia; só o que não cabe na espera é descartado, e tudo é contado.
+    """
+
+    def __init__(self, k, spill_size=None, key=lambda item: item['relevance_score']):
+        self.k = k
+        self.spill_size = 4 * k if spill_size is None else spill_size
+        self.key = key
+        self.heap = []
+        self.spill = []
+        self.counter = itertools.count()
+        self.offered = 0
+        self.selected = 0
+        self.deferred = 0
+        self.dropped = 0
+
+    def offer(self, item):
+        self.offered += 1
+        self._push((self.key(item), next(self.counter), item))
+
+    def _push(self, entry):
+        if len(self.heap) < self.k:
+            heapq.heappush(self.heap, entry)
+            return
+        if entry[0] > self.heap[0][0]:
+            entry = heapq.heapreplace(self.heap, entry)
+        self._defer(entry)
+
+    def _defer(self, entry):
+        if len(self.spill) < self.spill_size:
+            heapq.heappush(self.spill, entry)
+            return
+        # Espera cheia: sai o menos relevante entre ela e o novo
+        if entry[0] > self.spill[0][0]:
+            entry = heapq.heapreplace(self.spill, entry)
+        self.dropped += 1
+
+    def take(self):
+        """Candidatos da fatia (mais relevante primeiro); a espera começa a próxima"""
+        selected = [item for _, _, item in sorted(self.heap, reverse=True)]
+        self.selected += len(selected)
+        self.heap = []
+        # Excedente adiado para a próxima fatia, do mais relevante para o menos
+        self.deferred += len(self.spill)
+        spill, self.spill = self.spill, []
+        for entry in sorted(spill, reverse=True):
+            self._push(entry)
+        return selected
+
+    def stats(self):
+        return {
+            'offered': self.offered,
+            'selected': self.selected,
+            'deferred': self.deferred,
+            'dropped': self.dropped,
+            'waiting': len(self.heap) + len(self.spill)
+        }
+
+
+class StreamPipeline:
+    """Ingest → análise → alerta em filas asyncio limitadas.
+
+    Os monitores colocam cada item relevante na fila de entrada assim que o
+    request que o trouxe termina; workers de análise transformam o item em
+    oportunidades e o estágio de alerta as envia na hora, sem esperar a fonte
+    mais lenta nem o fim do ciclo. Filas cheias fazem quem produz esperar
+    (backpressure) em vez de acumular memória. Mede o atraso da publicação
+    do post até o alerta e o tempo gasto dentro do próprio pipeline.
+    """
+
+    def __init__(self, analyze, alert, queue_size=200, workers=2):
+        # analyze: async (item) -> [oportunidades]; alert: (oportunidade) -> bool
+        self.analyze = analyze
+        self.alert = alert
+        self.queue_size = queue_size
+        self.workers = workers
+        self.items = None
+        self.alerts = None
+        self.tasks = []
+        self.ingested = 0
+        self.analyzed = 0
+        self.opportunities = 0
+        self.alerted = 0
+        self.errors = 0
+        self.backpressure = 0
+        self.post_latency = deque(maxlen=500)
+        self.pipeline_latency = deque(maxlen=500)
+
+    def start(self):
+        if self.tasks:
+            return
+        self.items = asyncio.Queue(self.queue_size)
+        self.alerts = asyncio.Queue(self.queue_size)
+        self.tasks = [asyncio.create_task(self._analyze_worker()) for _ in range(self.workers)]
+        self.tasks.append(asyncio.create_task(self._alert_worker()))
+
+    async def put(self, item):
+        """Entrada do pipeline; espera enquanto a fila estiver cheia"""
+        if self.items.full():
+            self.backpressure += 1
+        self.ingested += 1
+        await self.items.put((item, time.time()))
+
+    async def _analyze_worker(self):
+        while True:
+            item, ingested_at = await self.items.get()
+            try:
+                for opportunity in await self.analyze(item):
+                    self.opportunities += 1
+                    await self.alerts.put((opportunity, item, ingested_at))
+                self.analyzed += 1
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"❌ Erro na análise do pipeline: {e}")
+            finally:
+                self.items.task_done()
+
+    async def _alert_worker(self):
+        while True:
+            opportunity, item, ingested_at = await self.alerts.get()
+            try:
+                if self.alert(opportunity):
+                    now = time.time()
+                    self.alerted += 1
+                    self.pipeline_latency.append(now - ingested_at)
+                    posted_at_ms = item.get('features', {}).get('posted_at_ms') or item_timestamp_ms(item)
+                    self.post_latency.append(now - posted_at_ms / 1000)
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"❌ Erro no alerta do pipeline: {e}")
+            finally:
+                self.alerts.task_done()
+
+    async def drain(self):
+        """Espera tudo que já entrou sair pelo estágio de alerta"""
+        await self.items.join()
+        await self.alerts.join()
+
+    async def close(self, timeout=10):
+        """Entrega o que já está nas filas (até timeout segundos) e para os workers"""
+        if self.tasks:
+            try:
+                await asyncio.wait_for(self.drain(), timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"⚠️  Pipeline encerrado com {self.items.qsize() + self.alerts.qsize()} itens na fila")
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
+
+    def stats(self):
+        return {
+            'ingested': self.ingested,
+            'analyzed': self.analyzed,
+            'opportunities': self.opportunities,
+            'alerted': self.alerted,
+            'errors': self.errors,
+            'backpressure': self.backpressure,
+            'queued': (self.items.qsize() + self.alerts.qsize()) if self.items else 0,
+            'post_to_alert_p50_s': round(percentile(self.post_latency, 0.5), 1),
+            'post_to_alert_p95_s': round(percentile(self.post_latency, 0.95), 1),
+            'ingest_to_alert_p95_ms': round(percentile(self.pipeline_latency, 0.95) * 1000, 1)
+        }
@@ -0,0 +1,97 @@
+import asyncio
+import logging
+import random
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class AdaptiveInterval:
+    """Intervalo de polling de uma chave guiado pela taxa de itens novos.
+
+    Mantém a média móvel de itens novos por segundo e escolhe o intervalo
+    que traz em média `target_items` por consulta: fontes quentes encurtam
+    até `min_interval`, e consultas vazias espaçam aos poucos até
+    `max_interval`.
+    """
+
+    def __init__(self, base, min_interval, max_interval, target_items=3, smoothing=0.3):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.target_items = target_items
+        self.smoothing = smoothing
+        self.interval = min(max_interval, max(min_interval, base))
+        self.rate = None
+        self.last_poll = None
+        self.next_due = 0.0
+        self.polls = 0
+        self.items = 0
+
+    def record(self, new_items, now):
+        if self.last_poll is not None:
+            observed = new_items / max(now - self.last_poll, 1.0)
+            self.rate = observed if self.rate is None else self.rate + self.smoothing * (observed - self.rate)
+            if self.rate > 0:
+                interval = self.target_items / self.rate
+            else:
+                interval = self.interval * 1.5
+            self.interval = min(self.max_interval, max(self.min_interval, interval))
+        self.last_poll = now
+        self.polls += 1
+        self.items += new_items
+        # Jitter para as chaves não sincronizarem
+        self.next_due = now + self.interval * random.uniform(0.9, 1.1)
+
+
+class PollSchedule:
+    """Intervalos adaptativos independentes por chave (subreddit, query, fonte)"""
+
+    def __init__(self, keys, base, min_interval, max_interval, target_items=3):
+        self.intervals = {
+            key: AdaptiveInterval(base, min_interval, max_interval, target_items)
+            for key in keys
+        }
+
+    def due(self):
+        """Chaves vencidas, das mais quentes (intervalo menor) para as mais frias"""
+        now = time.monotonic()
+        due = [key for key, interval in self.intervals.items() if now >= interval.next_due]
+        due.sort(key=lambda key: self.intervals[key].interval)
+        return due
+
+    def record(self, keys, counts):
+        now = time.monotonic()
+        for key in keys:
+            self.intervals[key].record(counts.get(key, 0), now)
+
+    def next_wake(self):
+        """Segundos até a próxima chave vencer"""
+        now = time.monotonic()
+        return max(1.0, min(interval.next_due for interval in self.intervals.values()) - now)
+
+    def stats(self):
+        return {
+            key: {
+                'interval': round(interval.interval),
+                'per_hour': round(interval.rate * 3600, 1) if interval.rate else 0
+            }
+            for key, interval in sorted(self.intervals.items(), key=lambda item: item[1].interval)
+        }
+
+
+async def poll_forever(name, schedule, poll):
+    """Loop próprio de uma fonte: consulta só as chaves vencidas e dorme até a próxima.
+
+    `poll(keys)` retorna {chave: itens novos}; cada chave reajusta o próprio
+    intervalo com essa contagem.
+    """
+    while True:
+        keys = schedule.due()
+        if keys:
+            try:
+                counts = await poll(keys)
+            except Exception as e:
+                logger.error(f"❌ Erro no loop de {name}: {e}")
+                counts = {}
+            schedule.record(keys, counts)
+        await asyncio.sleep(schedule.next_wake())
@@ -0,0 +1,329 @@
+import asyncio
+import hashlib
+import logging
+import math
+import re
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+MAX_SENTIMENT_TEXT = 1000  # mesmo corte que o analisador usa para limitar custo
+
+# Valência de -4 (muito negativo) a +4 (muito positivo), com gírias de crypto
+LEXICON = {
+    # Positivos
+    'moon': 3.0, 'mooning': 3.0, 'moonshot': 2.5, 'tothemoon': 3.2, 'pump': 1.5, 'pumping': 2.0,
+    'bullish': 3.0, 'bull': 1.5, 'bullrun': 3.0, 'gem': 2.5, 'lfg': 3.0, 'wagmi': 3.0, 'gm': 1.0,
+    'hodl': 1.5, 'ape': 1.5, 'aping': 1.5, 'apein': 2.0, 'sendit': 2.0, 'sending': 1.5,
+    'rocket': 2.5, 'lambo': 2.5, 'based': 2.0, 'alpha': 1.5, 'undervalued': 2.0, 'legit': 2.5,
+    'safu': 2.5, 'doxxed': 2.0, 'audited': 2.0, 'lplocked': 2.0, 'renounced': 1.5,
+    'diamondhands': 2.0, 'profit': 2.0, 'profits': 2.0, 'gains': 2.5, 'win': 2.0, 'winning': 2.5,
+    'huge': 1.5, 'amazing': 3.0, 'great': 3.0, 'good': 2.0, 'love': 3.0, 'best': 3.0,
+    'strong': 2.0, 'explode': 2.0, 'exploding': 2.5, 'breakout': 2.0, 'ath': 2.0,
+    '10x': 2.5, '100x': 3.0, '1000x': 3.0, '10000x': 3.0, 'massive': 2.0, 'insane': 2.0,
+    'fire': 2.0, 'legendary': 3.0, 'excited': 2.5, 'opportunity': 1.5,
+    # Negativos
+    'rug': -4.0, 'rugged': -4.0, 'rugpull': -4.0, 'scam': -4.0, 'scammer': -4.0, 'scammers': -4.0,
+    'exitscam': -4.0, 'honeypot': -4.0, 'ngmi': -3.0, 'rekt': -3.0, 'dump': -2.5, 'dumping': -3.0,
+    'dumped': -2.5, 'bearish': -3.0, 'bear': -1.5, 'crash': -3.0, 'crashing': -3.0, 'fud': -2.0,
+    'ponzi': -4.0, 'fake': -3.0, 'avoid': -2.5, 'bagholder': -2.5, 'bagholders': -2.5,
+    'loss': -2.5, 'lost': -2.0, 'losing': -2.5, 'dead': -3.0, 'shitcoin': -2.0, 'worthless': -3.5,
+    'bad': -2.5, 'terrible': -3.0, 'worst': -3.5, 'hacked': -3.5, 'exploit': -3.0,
+    'exploited': -3.5, 'drained': -3.5, 'warning': -2.0, 'beware': -2.5, 'sus': -2.0,
+    'jeet': -2.0, 'jeets': -2.0, 'paperhands': -1.5, 'cope': -1.5, 'overvalued': -2.0,
+    'devsold': -3.0, 'devdumped': -3.5, 'liquidityremoved': -4.0, 'noliquidity': -3.0,
+}
+
+EMOJI = {
+    '🚀': 2.5, '🌙': 2.0, '🌕': 2.0, '💎': 2.0, '🔥': 2.0, '💰': 2.0, '📈': 2.0, '🐂': 2.0,
+    '✅': 1.5, '💪': 1.5, '🤑': 2.0, '🎉': 2.0, '🙌': 1.5, '👀': 0.5,
+    '📉': -2.0, '🐻': -2.0, '💀': -2.0, '🚨': -1.5, '⚠': -2.0, '❌': -2.0, '🤡': -2.5,
+    '😭': -1.5, '💩': -3.0, '🩸': -2.0,
+}
+
+# Expressões de várias palavras viram um único token do léxico
+PHRASES = {
+    ('rug', 'pull'): 'rugpull', ('rug', 'pulled'): 'rugpull', ('exit', 'scam'): 'exitscam',
+    ('to', 'the', 'moon'): 'tothemoon', ('dev', 'sold'): 'devsold', ('dev', 'dumped'): 'devdumped',
+    ('liquidity', 'removed'): 'liquidityremoved', ('no', 'liquidity'): 'noliquidity',
+    ('paper', 'hands'): 'paperhands', ('diamond', 'hands'): 'diamondhands',
+    ('ape', 'in'): 'apein', ('send', 'it'): 'sendit', ('lp', 'locked'): 'lplocked',
+}
+PHRASE_STARTS = {}
+for _phrase, _token in PHRASES.items():
+    PHRASE_STARTS.setdefault(_phrase[0], []).append((_phrase, _token))
+for _options in PHRASE_STARTS.values():
+    _options.sort(key=lambda option: len(option[0]), reverse=True)
+
+NEGATIONS = {
+    'not', 'no', 'never', 'dont', "don't", 'isnt', "isn't", 'wasnt', "wasn't", 'aint', "ain't",
+    'cant', "can't", 'cannot', 'without', 'nobody', 'nothing', 'neither', 'nor', 'wont', "won't",
+}
+BOOSTERS = {
+    'very': 0.3, 'really': 0.3, 'super': 0.3, 'extremely': 0.4, 'so': 0.2, 'totally': 0.3,
+    'absolutely': 0.4, 'mega': 0.3, 'hella': 0.3, 'insanely': 0.4, 'fucking': 0.4,
+    'slightly': -0.3, 'kinda': -0.3, 'somewhat': -0.3, 'barely': -0.3,
+}
+
+TOKEN = re.compile(r"[\w'$#]+|" + '|'.join(re.escape(emoji) for emoji in sorted(EMOJI, key=len, reverse=True)))
+NEGATION_FACTOR = -0.74
+CAPS_BOOST = 0.733
+EXCLAMATION_BOOST = 0.292
+NORMALIZATION_ALPHA = 15
+
+
+class LexiconSentimentAnalyzer:
+    """Sentimento offline por léxico + regras (estilo VADER), com gírias de crypto e emoji.
+
+    Mesmo contrato do cliente do Google ({"score", "magnitude", "error"}):
+    score em [-1, 1] e magnitude >= 0 proporcional à carga emocional total.
+    Tabelas compiladas no import; cada documento é uma varredura de regex e
+    lookups em dict, sem rede nem custo por chamada.
+    """
+
+    blocking = False
+
+    def _tokens(self, text):
+        raw = TOKEN.findall(text)
+        lowered = [token.lower().lstrip('#$') for token in raw]
+        tokens = []
+        i = 0
+        while i < len(lowered):
+            token = lowered[i]
+            for phrase, merged in PHRASE_STARTS.get(token, ()):
+                if tuple(lowered[i:i + len(phrase)]) == phrase:
+                    tokens.append((merged, raw[i]))
+                    i += len(phrase)
+                    break
+            else:
+                tokens.append((token, raw[i]))
+                i += 1
+        return tokens
+
+    def score(self, text):
+        """(score, magnitude, hits) do texto"""
+        tokens = self._tokens(text[:MAX_SENTIMENT_TEXT])
+        shouting = text.isupper()
+        valences = []
+        but_at = None
+
+        for i, (token, raw) in enumerate(tokens):
+            if token == 'but':
+                but_at = len(valences)
+                continue
+
+            valence = LEXICON.get(token)
+            if valence is None:
+                valence = EMOJI.get(raw)
+                if valence is None:
+                    continue
+
+            sign = 1 if valence > 0 else -1
+            negated = False
+            for distance, (previous, _) in enumerate(tokens[max(0, i - 3):i][::-1]):
+                if previous in BOOSTERS:
+                    valence += sign * BOOSTERS[previous] * (1 - 0.05 * distance)
+                elif previous in NEGATIONS and not negated:
+                    valence *= NEGATION_FACTOR
+                    negated = True
+
+            # ÊNFASE em caixa alta (quando o resto do texto não está todo em maiúsculas)
+            if not shouting and len(raw) > 1 and raw.isupper():
+                valence += CAPS_BOOST if valence > 0 else -CAPS_BOOST
+
+            valences.append(valence)
+
+        if not valences:
+            return 0.0, 0.0, 0
+
+        # "X but Y": o que vem depois do but pesa mais
+        if but_at is not None:
+            valences = [v * 0.5 for v in valences[:but_at]] + [v * 1.5 for v in valences[but_at:]]
+
+        total = sum(valences)
+        if total:
+            total += math.copysign(min(text.count('!'), 4) * EXCLAMATION_BOOST, total)
+
+        score = total / math.sqrt(total * total + NORMALIZATION_ALPHA)
+        magnitude = sum(abs(v) for v in valences) / 4
+        return max(-1.0, min(1.0, score)), magnitude, len(valences)
+
+    def analyze_sentiment(self, text):
+        if not text:
+            return {"score": 0, "magnitude": 0, "error": True}
+        score, magnitude, _ = self.score(text)
+        return {
+            "score": round(score, 3),
+            "magnitude": round(magnitude, 3),
+            "error": False
+        }
+
+
+class GoogleSentimentAnalyzer:
+    """Cliente do Google Cloud Natural Language (opcional: import só quando usado)"""
+
+    blocking = True
+
+    def __init__(self):
+        self.client = None
+        try:
+            from google.cloud import language_v1
+        except ImportError:
+            logger.warning("⚠️  google-cloud-language não instalado - sentimento do Google desativado")
+            return
+
+        self.language_v1 = language_v1
+        try:
+            self.client = language_v1.LanguageServiceClient()
+            logger.info("✅ Google Cloud Natural Language API client inicializado.")
+        except Exception as e:
+            logger.error(f"❌ Erro ao inicializar o cliente do Google Cloud: {e}")
+            self.client = None
+
+    def analyze_sentiment(self, text):
+        if not self.client or not text:
+            return {"score": 0, "magnitude": 0, "error": True}
+
+        # Limita o texto para evitar custos excessivos
+        truncated_text = text[:MAX_SENTIMENT_TEXT]
+
+        document = self.language_v1.Document(content=truncated_text, type_=self.language_v1.Document.Type.PLAIN_TEXT)
+
+        try:
+            sentiment = self.client.analyze_sentiment(document=document).document_sentiment
+            return {
+                "score": sentiment.score,
+                "magnitude": sentiment.magnitude,
+                "error": False
+            }
+        except Exception as e:
+            logger.error(f"❌ Erro ao analisar sentimento: {e}")
+            return {"score": 0, "magnitude": 0, "error": True}
+
+
+class HybridSentimentAnalyzer:
+    """Léxico primeiro; Google só para textos sem nenhum termo do léxico"""
+
+    blocking = True
+
+    def __init__(self, lexicon, fallback):
+        self.lexicon = lexicon
+        self.fallback = fallback
+        self.fallback_calls = 0
+
+    def analyze_sentiment(self, text):
+        if not text:
+            return {"score": 0, "magnitude": 0, "error": True}
+        score, magnitude, hits = self.lexicon.score(text)
+        if hits:
+            return {"score": round(score, 3), "magnitude": round(magnitude, 3), "error": False}
+        self.fallback_calls += 1
+        return self.fallback.analyze_sentiment(text)
+
+
+def create_sentiment_analyzer(engine='lexicon'):
+    """Analisador escolhido por deploy: lexicon (padrão), google ou hybrid"""
+    engine = (engine or 'lexicon').lower()
+    if engine in ('google', 'hybrid'):
+        google = GoogleSentimentAnalyzer()
+        if google.client is None:
+            logger.warning("⚠️  Google indisponível - usando o léxico offline")
+        elif engine == 'google':
+            return google
+        else:
+            return HybridSentimentAnalyzer(LexiconSentimentAnalyzer(), google)
+    logger.info("✅ Sentimento offline (léxico crypto) ativo")
+    return LexiconSentimentAnalyzer()
+
+
+class SentimentStage:
+    """Análise de sentimento fora do event loop, com concorrência limitada e cache LRU.
+
+    `analyzer.analyze_sentiment(text)` é bloqueante (gRPC do Google Cloud) e
+    roda num pool de threads próprio. Resultados são guardados pelo hash do
+    texto efetivamente enviado, então cross-posts e re-fetches não pagam de
+    novo; pedidos simultâneos do mesmo texto compartilham uma só chamada.
+    """
+
+    def __init__(self, analyzer, concurrency=4, cache_size=2048):
+        self.analyzer = analyzer
+        self.semaphore = asyncio.Semaphore(max(1, concurrency))
+        self.executor = ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix='sentiment')
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.inflight = {}
+        self.requests = 0
+        self.cache_hits = 0
+        self.api_calls = 0
+        self.errors = 0
+        self.total_latency = 0.0
+
+    @staticmethod
+    def content_key(text):
+        return hashlib.blake2b(text[:MAX_SENTIMENT_TEXT].encode(), digest_size=16).digest()
+
+    async def analyze(self, text):
+        self.requests += 1
+        key = self.content_key(text)
+
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            self.cache_hits += 1
+            return self.cache[key]
+
+        if key in self.inflight:
+            self.cache_hits += 1
+            return await asyncio.shield(self.inflight[key])
+
+        future = asyncio.ensure_future(self._call(key, text))
+        self.inflight[key] = future
+        try:
+            return await asyncio.shield(future)
+        finally:
+            self.inflight.pop(key, None)
+
+    async def _call(self, key, text):
+        if not getattr(self.analyzer, 'blocking', True):
+            # Léxico offline: microssegundos, não compensa ir para o pool
+            result = self.analyzer.analyze_sentiment(text)
+            self.api_calls += 1
+            return self._store(key, result)
+
+        async with self.semaphore:
+            started = time.monotonic()
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self.executor, self.analyzer.analyze_sentiment, text)
+            self.total_latency += time.monotonic() - started
+            self.api_calls += 1
+
+        return self._store(key, result)
+
+    def _store(self, key, result):
+        if result.get('error'):
+            # Falhas não entram no cache: a próxima aparição tenta de novo
+            self.errors += 1
+            return result
+
+        self.cache[key] = result
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return result
+
+    async def analyze_many(self, texts):
+        """Sentimento de vários textos em paralelo (limitado), na mesma ordem"""
+        return await asyncio.gather(*[self.analyze(text) for text in texts])
+
+    def close(self):
+        self.executor.shutdown(wait=False)
+
+    def stats(self):
+        return {
+            'requests': self.requests,
+            'cache_hits': self.cache_hits,
+            'api_calls': self.api_calls,
+            'errors': self.errors,
+            'cached': len(self.cache),
+            'avg_latency_ms': round(self.total_latency / self.api_calls * 1000, 1) if self.api_calls else 0
+        }
@@ -0,0 +1,193 @@
+import asyncio
+import logging
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS seen (
+    key INTEGER PRIMARY KEY,
+    seen_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS seen_by_time ON seen (seen_at);
+CREATE TABLE IF NOT EXISTS alerts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    alert_id TEXT NOT NULL,
+    type TEXT,
+    source TEXT,
+    url TEXT,
+    sent_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS alerts_by_time ON alerts (sent_at);
+CREATE TABLE IF NOT EXISTS blooms (
+    generation INTEGER PRIMARY KEY,
+    count INTEGER NOT NULL,
+    bits BLOB NOT NULL
+);
+"""
+
+
+def to_signed(key):
+    # SQLite guarda INTEGER com sinal; as chaves do DedupStore são 64 bits sem sinal
+    return key - (1 << 64) if key >= (1 << 63) else key
+
+
+def to_unsigned(key):
+    return key + (1 << 64) if key < 0 else key
+
+
+class StateStore:
+    """Estado de dedup e histórico de alertas em SQLite (WAL), fora do event loop.
+
+    Todo acesso ao banco roda numa única thread dedicada; o loop só enfileira
+    chaves/alertas em memória e uma task grava em lote a cada
+    `flush_interval` segundos. No boot só a janela viva do dedup (seen_at
+    dentro do TTL) e os bits do Bloom são carregados, então o tempo de
+    startup não cresce com o histórico; alertas mais velhos que o TTL saem
+    na mesma varredura do dedup. Banco que não abre deixa o bot só com o
+    dedup em memória.
+    """
+
+    def __init__(self, path, flush_interval=5):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='state-store')
+        self.conn = None
+        self.pending_seen = []
+        self.pending_alerts = []
+        self.task = None
+        self.written = 0
+        self.flushes = 0
+        self.load_ms = 0.0
+        self.ttl = None
+        self.saved_expired = 0
+
+    async def _run(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+
+    def _open(self):
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+
+    def _load(self, ttl):
+        self.ttl = ttl
+        cutoff = time.time() - ttl
+        self.conn.execute('DELETE FROM seen WHERE seen_at < ?', (cutoff,))
+        self.conn.execute('DELETE FROM alerts WHERE sent_at < ?', (cutoff,))
+        self.conn.commit()
+        entries = [(to_unsigned(key), seen_at) for key, seen_at in self.conn.execute(
+            'SELECT key, seen_at FROM seen WHERE seen_at >= ? ORDER BY seen_at', (cutoff,)
+        )]
+        blooms = self.conn.execute('SELECT count, bits FROM blooms ORDER BY generation').fetchall()
+        return entries, blooms
+
+    async def load_into(self, dedup):
+        """Abre o banco e restaura o DedupStore; retorna quantas chaves vieram do disco"""
+        started = time.perf_counter()
+        try:
+            await self._run(self._open)
+            entries, blooms = await self._run(self._load, dedup.ttl)
+        except Exception as e:
+            # Banco inacessível, travado ou corrompido: segue só com o dedup em memória
+            logger.error(f"❌ Erro carregando estado de {self.path}, seguindo sem persistência: {e}")
+            if self.conn is not None:
+                await self._run(self.conn.close)
+                self.conn = None
+            return 0
+        dedup.restore(entries, blooms)
+        dedup.journal = self.record_seen
+        self.load_ms = round((time.perf_counter() - started) * 1000, 1)
+        logger.info(f"💾 Estado carregado: {len(entries)} IDs em {self.load_ms} ms")
+        return len(entries)
+
+    def start(self, dedup):
+        if self.conn is None:
+            return
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._flusher(dedup))
+
+    def record_seen(self, key, seen_at):
+        self.pending_seen.append((to_signed(key), seen_at))
+
+    def record_alert(self, alert_id, opportunity):
+        if self.conn is None:
+            return
+        self.pending_alerts.append((
+            alert_id,
+            opportunity.get('type'),
+            opportunity.get('source'),
+            opportunity.get('url'),
+            time.time()
+        ))
+
+    async def _flusher(self, dedup):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush(dedup)
+            except Exception as e:
+                logger.error(f"❌ Erro gravando estado: {e}")
+
+    def _write(self, seen, alerts, blooms):
+        with self.conn:
+            if seen:
+                self.conn.executemany(
+                    'INSERT INTO seen (key, seen_at) VALUES (?, ?) '
+                    'ON CONFLICT(key) DO UPDATE SET seen_at = excluded.seen_at', seen
+                )
+            if alerts:
+                self.conn.executemany(
+                    'INSERT INTO alerts (alert_id, type, source, url, sent_at) VALUES (?, ?, ?, ?, ?)', alerts
+                )
+            if blooms is not None:
+                # Chaves que saíram do TTL já estão no Bloom; alertas seguem a mesma janela
+                cutoff = time.time() - self.ttl
+                self.conn.execute('DELETE FROM seen WHERE seen_at < ?', (cutoff,))
+                self.conn.execute('DELETE FROM alerts WHERE sent_at < ?', (cutoff,))
+                self.conn.execute('DELETE FROM blooms')
+                self.conn.executemany(
+                    'INSERT INTO blooms (generation, count, bits) VALUES (?, ?, ?)',
+                    [(i, count, bits) for i, (count, bits) in enumerate(blooms)]
+                )
+
+    async def flush(self, dedup=None):
+        """Grava em lote o que acumulou desde o último flush"""
+        if self.conn is None:
+            return
+        seen, self.pending_seen = self.pending_seen, []
+        alerts, self.pending_alerts = self.pending_alerts, []
+        # Bits do Bloom só mudam quando chaves expiram do TTL
+        blooms = None
+        if dedup is not None and dedup.expired != self.saved_expired:
+            blooms = dedup.bloom_state()
+            self.saved_expired = dedup.expired
+        if not seen and not alerts and blooms is None:
+            return
+        await self._run(self._write, seen, alerts, blooms)
+        self.written += len(seen) + len(alerts)
+        self.flushes += 1
+
+    async def close(self, dedup=None):
+        if self.task is not None:
+            self.task.cancel()
+        try:
+            await self.flush(dedup)
+        except Exception as e:
+            logger.error(f"❌ Erro gravando estado no shutdown: {e}")
+        if self.conn is not None:
+            await self._run(self.conn.close)
+            self.conn = None
+        self.executor.shutdown(wait=False)
+
+    def stats(self):
+        return {
+            'pending': len(self.pending_seen) + len(self.pending_alerts),
+            'written': self.written,
+            'flushes': self.flushes,
+            'load_ms': self.load_ms
+        }
@@ -0,0 +1,128 @@
+import asyncio
+import logging
+import time
+
+from throttle import RequestBudget
+
+logger = logging.getLogger(__name__)
+
+
+class TelegramSender:
+    """Fila assíncrona de alertas com uma task dedicada de envio.
+
+    Quem detecta só enfileira (enqueue não bloqueia); a task respeita os
+    limites do Telegram com dois token buckets (por chat e global) e o
+    retry_after devolvido em 429.
+    """
+
+    def __init__(self, http, token, chat_id, chat_per_minute=20, global_per_second=30,
+                 maxsize=500, max_attempts=5):
+        self.http = http
+        self.token = token
+        self.chat_id = chat_id
+        self.chat_budget = RequestBudget(chat_per_minute, burst=3)
+        self.global_budget = RequestBudget(global_per_second * 60, burst=global_per_second)
+        self.queue = asyncio.Queue(maxsize)
+        self.max_attempts = max_attempts
+        self.task = None
+        self.sent = 0
+        self.failed = 0
+        self.dropped = 0
+        self.retries = 0
+        self.total_latency = 0.0
+
+    @property
+    def configured(self):
+        return bool(self.token and self.chat_id)
+
+    def start(self):
+        if self.configured and (self.task is None or self.task.done()):
+            self.task = asyncio.create_task(self._worker())
+
+    def enqueue(self, message):
+        """Coloca a mensagem na fila; se cheia, descarta a mais antiga"""
+        if not self.configured:
+            return False
+
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.queue.task_done()
+            self.dropped += 1
+            logger.warning("⚠️  Fila do Telegram cheia - alerta mais antigo descartado")
+
+        self.queue.put_nowait((message, time.monotonic()))
+        return True
+
+    async def _worker(self):
+        while True:
+            message, enqueued_at = await self.queue.get()
+            try:
+                if await self.deliver(message):
+                    self.sent += 1
+                    self.total_latency += time.monotonic() - enqueued_at
+                else:
+                    self.failed += 1
+            except Exception as e:
+                self.failed += 1
+                logger.error(f"❌ Erro Telegram: {e}")
+            finally:
+                self.queue.task_done()
+
+    async def deliver(self, message):
+        for attempt in range(self.max_attempts):
+            await self.chat_budget.acquire()
+            await self.global_budget.acquire()
+
+            try:
+                status, retry_after = await self._post(message)
+            except Exception as e:
+                logger.warning(f"⚠️  Telegram indisponível ({e}) - tentativa {attempt + 1}")
+                status, retry_after = None, 2 ** attempt
+
+            if status == 200:
+                return True
+            if status is not None and status != 429:
+                logger.error(f"❌ Telegram recusou a mensagem: {status}")
+                return False
+
+            self.retries += 1
+            await asyncio.sleep(retry_after)
+
+        return False
+
+    async def _post(self, message):
+        url = f"https://api.telegram.org/bot{self.token}/sendMessage"
+        payload = {
+            "chat_id": self.chat_id,
+            "text": message,
+            "parse_mode": "HTML",
+            "disable_web_page_preview": True
+        }
+
+        async with self.http.session.post(url, json=payload, timeout=self.http.timeout(10)) as response:
+            retry_after = 0
+            if response.status == 429:
+                data = await response.json(content_type=None)
+                retry_after = data.get('parameters', {}).get('retry_after', 1)
+                logger.warning(f"⚠️  Telegram rate limit - aguardando {retry_after}s")
+            return response.status, retry_after
+
+    async def close(self, timeout=5):
+        """Tenta esvaziar a fila antes de parar a task"""
+        if self.task is None:
+            return
+        try:
+            await asyncio.wait_for(self.queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"⚠️  {self.queue.qsize()} alertas não enviados no shutdown")
+        self.task.cancel()
+
+    def stats(self):
+        return {
+            'queued': self.queue.qsize(),
+            'sent': self.sent,
+            'failed': self.failed,
+            'dropped': self.dropped,
+            'retries': self.retries,
+            'avg_delivery_seconds': round(self.total_latency / self.sent, 2) if self.sent else 0
+        }
@@ -0,0 +1,259 @@
+import asyncio
+import time
+
+
+class RequestBudget:
+    """Orçamento compartilhado de requests por minuto (token bucket)"""
+
+    def __init__(self, qpm, burst=None):
+        self.qpm = qpm
+        self.rate = qpm / 60.0
+        self.capacity = burst if burst else max(1, qpm // 3)
+        self.tokens = float(self.capacity)
+        self.last_refill = time.monotonic()
+        self.lock = asyncio.Lock()
+        self.total_requests = 0
+        self.total_wait = 0.0
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+        self.last_refill = now
+
+    async def _take_token(self):
+        self._refill()
+        while self.tokens < 1:
+            wait = (1 - self.tokens) / self.rate
+            self.total_wait += wait
+            await asyncio.sleep(wait)
+            self._refill()
+        self.tokens -= 1
+
+    async def acquire(self):
+        """Espera até haver orçamento para mais um request (ordem FIFO)"""
+        async with self.lock:
+            await self._take_token()
+            self.total_requests += 1
+
+    def stats(self):
+        return {
+            'qpm': self.qpm,
+            'requests': self.total_requests,
+            'wait_seconds': round(self.total_wait, 2),
+            'tokens': round(self.tokens, 2)
+        }
+
+
+class RateGovernor(RequestBudget):
+    """Ritmo guiado pelos headers X-Ratelimit-* do Reddit.
+
+    Distribui a cota restante igualmente até o reset da janela. Enquanto não
+    há headers válidos (início ou janela expirada) usa o token bucket QPM.
+    """
+
+    def __init__(self, qpm, burst=None):
+        super().__init__(qpm, burst)
+        self.remaining = None
+        self.used = None
+        self.reset_at = 0.0
+        self.next_slot = 0.0
+        self.blocked_until = 0.0
+        self.backoffs = 0
+
+    def update(self, headers):
+        """Lê X-Ratelimit-Remaining/Used/Reset de um response"""
+        remaining = headers.get('X-Ratelimit-Remaining')
+        reset = headers.get('X-Ratelimit-Reset')
+        if remaining is None or reset is None:
+            return
+        try:
+            self.remaining = float(remaining)
+            self.reset_at = time.monotonic() + float(reset)
+            self.used = float(headers.get('X-Ratelimit-Used', 0))
+        except ValueError:
+            self.remaining = None
+
+    def backoff(self, seconds):
+        """Bloqueia todos os requests pelo tempo pedido pelo servidor (429)"""
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+        self.backoffs += 1
+
+    async def _sleep(self, wait):
+        if wait > 0:
+            self.total_wait += wait
+            await asyncio.sleep(wait)
+
+    async def acquire(self):
+        async with self.lock:
+            await self._sleep(self.blocked_until - time.monotonic())
+
+            now = time.monotonic()
+            if self.remaining is None or now >= self.reset_at:
+                await self._take_token()
+            elif self.remaining < 1:
+                # Cota esgotada: só volta depois do reset da janela
+                await self._sleep(self.reset_at - now)
+                self.remaining = None
+            else:
+                await self._sleep(self.next_slot - now)
+                now = time.monotonic()
+                interval = max(self.reset_at - now, 0) / self.remaining
+                self.next_slot = now + interval
+                self.remaining -= 1
+
+            self.total_requests += 1
+
+    def stats(self):
+        stats = super().stats()
+        stats.update({
+            'remaining': self.remaining,
+            'used': self.used,
+            'reset_in': round(max(self.reset_at - time.monotonic(), 0), 1),
+            'backoffs': self.backoffs
+        })
+        return stats
+
+
+class QuotaPlanner:
+    """Planejamento da cota do Twitter (x-rate-limit-*) por rendimento das queries.
+
+    A cada ciclo reserva para as buscas a fração da cota restante que
+    corresponde ao tempo do ciclo até o reset da janela, e entrega essas
+    requests às queries que mais renderam tweets novos e relevantes por
+    request (média móvel). Queries nunca testadas vão primeiro e as paradas
+    ganham prioridade aos poucos, para nenhuma ficar sem amostragem.
+    """
+
+    def __init__(self, limit=450, window=900, cycle_seconds=300, max_pages=3, smoothing=0.3):
+        self.limit = limit
+        self.window = window
+        self.cycle_seconds = cycle_seconds
+        self.max_pages = max_pages
+        self.smoothing = smoothing
+        self.remaining = None
+        self.reset_at = 0.0
+        self.blocked_until = 0.0
+        self.credit = 0.0
+        self.last_plan = None
+        self.last_budget = 0
+        self.yields = {}
+        self.idle_cycles = {}
+        self.requests = 0
+        self.relevant = 0
+        self.denied = 0
+
+    def update(self, headers):
+        """Lê x-rate-limit-remaining/reset (reset em epoch) de um response"""
+        remaining = headers.get('x-rate-limit-remaining')
+        reset = headers.get('x-rate-limit-reset')
+        if remaining is None or reset is None:
+            return
+        try:
+            self.remaining = int(remaining)
+            self.reset_at = float(reset)
+            self.limit = int(headers.get('x-rate-limit-limit', self.limit))
+        except ValueError:
+            self.remaining = None
+
+    def block_until(self, reset_at):
+        """429: nenhuma request até o reset informado pelo servidor"""
+        self.blocked_until = max(self.blocked_until, reset_at)
+        self.remaining = 0
+        self.reset_at = reset_at
+
+    def _available(self, now):
+        if now < self.blocked_until:
+            return 0, self.blocked_until - now
+        if self.remaining is None or now >= self.reset_at:
+            # Sem headers ou janela vencida: cota cheia
+            return self.limit, self.window
+        return self.remaining, max(self.reset_at - now, 1.0)
+
+    def plan(self, queries):
+        """[(query, páginas)] do ciclo, da query mais rentável para a menos"""
+        now = time.time()
+        if self.last_plan is not None:
+            # Duração real do ciclo (média móvel), usada para dividir a janela
+            self.cycle_seconds += self.smoothing * ((now - self.last_plan) - self.cycle_seconds)
+        self.last_plan = now
+
+        available, time_left = self._available(now)
+        share = available * min(1.0, self.cycle_seconds / time_left) + self.credit
+        budget = min(int(share), available)
+        self.credit = share - budget if available else 0.0
+        self.last_budget = budget
+
+        def priority(query):
+            if query not in self.yields:
+                return float('inf')
+            return self.yields[query] + 0.1 * self.idle_cycles.get(query, 0)
+
+        ranked = sorted(queries, key=priority, reverse=True)
+        chosen = ranked[:budget]
+        for query in ranked[budget:]:
+            self.idle_cycles[query] = self.idle_cycles.get(query, 0) + 1
+
+        # Sobra do orçamento vira páginas extras (next_token) das mais rentáveis
+        pages = {query: 1 for query in chosen}
+        extra = budget - len(chosen)
+        while extra > 0 and chosen:
+            progressed = False
+            for query in chosen:
+                if extra and pages[query] < self.max_pages:
+                    pages[query] += 1
+                    extra -= 1
+                    progressed = True
+            if not progressed:
+                break
+
+        return [(query, pages[query]) for query in chosen]
+
+    def take(self):
+        """Consome uma request da cota; False (sem dormir) se não houver"""
+        now = time.time()
+        available, _ = self._available(now)
+        if available < 1:
+            self.denied += 1
+            return False
+        if self.remaining is not None and now < self.reset_at:
+            self.remaining -= 1
+        self.requests += 1
+        return True
+
+    def record(self, query, requests, relevant):
+        """Rendimento da query: tweets novos e relevantes por request"""
+        self.idle_cycles[query] = 0
+        self.relevant += relevant
+        if not requests:
+            return
+        observed = relevant / requests
+        previous = self.yields.get(query)
+        self.yields[query] = observed if previous is None else previous + self.smoothing * (observed - previous)
+
+    def stats(self):
+        now = time.time()
+        available, time_left = self._available(now)
+        return {
+            'remaining': available,
+            'reset_in': round(time_left),
+            'cycle_budget': self.last_budget,
+            'requests': self.requests,
+            'relevant_per_request': round(self.relevant / self.requests, 2) if self.requests else 0,
+            'denied': self.denied,
+            'yields': {query[:30]: round(value, 2) for query, value in self.yields.items()}
+        }
+
+
+async def run_bounded(items, worker, concurrency):
+    """Executa worker(item) para todos os itens com no máximo `concurrency` em paralelo.
+
+    Retorna os resultados na mesma ordem dos itens; exceções são devolvidas
+    no lugar do resultado (como gather com return_exceptions=True).
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run_one(item):
+        async with semaphore:
+            return await worker(item)
+
+    return await asyncio.gather(*[run_one(item) for item in items], return_exceptions=True)
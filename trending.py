@@ -0,0 +1,122 @@
+import math
+import time
+
+WINDOWS = (300, 3600, 86400)  # 5 min, 1 h, 24 h
+
+
+class TokenCounter:
+    """Contadores com decaimento exponencial de um token, um por janela"""
+
+    __slots__ = ('counts', 'updated_at', 'error', 'armed', 'alerted_at')
+
+    def __init__(self, now, error=0.0):
+        self.counts = [0.0] * len(WINDOWS)
+        self.updated_at = now
+        # Contagem herdada na troca do Space-Saving (superestimativa máxima da janela de 24 h)
+        self.error = error
+        self.counts[-1] = error
+        self.armed = True
+        self.alerted_at = 0.0
+
+    def decayed(self, now):
+        elapsed = max(now - self.updated_at, 0.0)
+        return [count * math.exp(-elapsed / window) for count, window in zip(self.counts, WINDOWS)]
+
+    def add(self, at, now, weight=1.0):
+        # Traz os contadores para `now` e soma a menção já decaída pela idade dela
+        self.counts = self.decayed(now)
+        self.updated_at = now
+        age = max(now - at, 0.0)
+        for i, window in enumerate(WINDOWS):
+            self.counts[i] += weight * math.exp(-age / window)
+
+
+class TrendingEngine:
+    """Tokens em aceleração em relação à própria média, com memória limitada.
+
+    Cada menção entra em contadores com decaimento exponencial de 5 min, 1 h
+    e 24 h, atualizados em O(1) sem guardar eventos. A velocidade é a taxa
+    dos últimos 5 min dividida pela taxa de fundo de 24 h (sem a própria
+    rajada, com um piso por hora); o alerta sai quando ela cruza o limiar
+    para cima, e o token só rearma depois de voltar abaixo da metade do
+    limiar e passar o cooldown. No máximo `capacity` tokens são acompanhados:
+    quando lota, o de menor contagem em 24 h sai e o novo herda essa
+    contagem como erro (Space-Saving), então os tokens frequentes nunca são
+    perdidos.
+    """
+
+    def __init__(self, capacity=1000, velocity_threshold=4.0, min_mentions=3, cooldown=3600,
+                 baseline_floor=1.0):
+        self.capacity = capacity
+        self.velocity_threshold = velocity_threshold
+        self.min_mentions = min_mentions
+        self.cooldown = cooldown
+        # Menções por hora assumidas no mínimo como fundo (token inédito não vira divisão por zero)
+        self.baseline_floor = baseline_floor / 3600
+        self.tokens = {}
+        self.mentions = 0
+        self.evictions = 0
+        self.alerts = 0
+
+    def _counter(self, token, now):
+        counter = self.tokens.get(token)
+        if counter is not None:
+            return counter
+        error = 0.0
+        if len(self.tokens) >= self.capacity:
+            victim = min(self.tokens, key=lambda name: self.tokens[name].decayed(now)[-1])
+            error = self.tokens.pop(victim).decayed(now)[-1]
+            self.evictions += 1
+        counter = self.tokens[token] = TokenCounter(now, error)
+        return counter
+
+    def velocity(self, counts):
+        """Taxa de 5 min sobre a taxa de fundo de 24 h"""
+        short, _, day = counts
+        recent_rate = short / WINDOWS[0]
+        baseline_rate = max((day - short) / WINDOWS[-1], self.baseline_floor)
+        return recent_rate / baseline_rate
+
+    def observe(self, token, at=None, now=None):
+        """Registra uma menção (at = horário do post); retorna o alerta se o token acabou de acelerar"""
+        now = time.time() if now is None else now
+        at = now if at is None else min(at, now)
+        counter = self._counter(token, now)
+        counter.add(at, now)
+        self.mentions += 1
+
+        counts = counter.counts
+        velocity = self.velocity(counts)
+        if not counter.armed:
+            if velocity < self.velocity_threshold / 2 and now - counter.alerted_at >= self.cooldown:
+                counter.armed = True
+            return None
+        if counts[0] < self.min_mentions or velocity < self.velocity_threshold:
+            return None
+
+        counter.armed = False
+        counter.alerted_at = now
+        self.alerts += 1
+        return {
+            'token': token,
+            'mentions_5m': round(counts[0], 1),
+            'mentions_1h': round(counts[1], 1),
+            'mentions_24h': round(max(counts[2] - counter.error, 0.0), 1),
+            'velocity': round(velocity, 1),
+            'started_at': now
+        }
+
+    def top(self, limit=5, now=None):
+        """Tokens mais citados nos últimos 5 min"""
+        now = time.time() if now is None else now
+        ranked = sorted(((counter.decayed(now), token) for token, counter in self.tokens.items()), reverse=True)
+        return [(token, round(counts[0], 1), round(self.velocity(counts), 1)) for counts, token in ranked[:limit]]
+
+    def stats(self):
+        return {
+            'tracked': len(self.tokens),
+            'mentions': self.mentions,
+            'evictions': self.evictions,
+            'alerts': self.alerts,
+            'top_5m': self.top()
+        }